@@ -10,10 +10,17 @@ Standalone — no external dependencies. Safe for code_execution_tool.
 
 from __future__ import annotations
 
+import calendar
 import json
+import sys
 import time
 import uuid
-from dataclasses import dataclass, asdict, field
+from bisect import bisect_right
+from collections import deque
+from collections.abc import Iterable
+from itertools import islice
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from typing import Any, Optional
 
 
@@ -43,30 +50,126 @@ def _cfg(config: Optional[dict[str, Any]], key: str, fallback: Any = None) -> An
     return DEFAULT_TRACKER_CONFIG.get(key, fallback)
 
 
+def _to_cents(x: float) -> int:
+    """EUR float -> integer cents, rounding half away from zero."""
+    return int(x * 100 + (0.5 if x >= 0 else -0.5))
+
+
+def _from_cents(c: int) -> float:
+    """Integer cents -> EUR float (JSON/memory boundary only)."""
+    return c / 100
+
+
+def _to_bp(rate: float) -> int:
+    """Fractional rate -> integer basis points (0.01 -> 100)."""
+    return int(rate * 10_000 + 0.5)
+
+
+def _apply_bp(amount_c: int, rate_bp: int) -> int:
+    """Apply a basis-point rate to a cent amount, rounding half up."""
+    return (amount_c * rate_bp + 5_000) // 10_000
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenTrackerCfg:
+    """Tracker config merged with defaults and pre-converted for the hot path.
+
+    Build with compile_config(); milestone tuples are sorted by threshold.
+    """
+    base_rate: float
+    briven_rate: float  # base + briven boost
+    gold_rate: float
+    base_rate_bp: int
+    briven_rate_bp: int
+    gold_rate_bp: int
+    gold_threshold_c: int
+    milestone_thr: tuple[float, ...]
+    milestone_thr_c: tuple[int, ...]
+    milestone_next_c: tuple[int, ...]  # milestone_thr_c + sentinel, indexed by bisect
+    milestone_label: tuple[str, ...]
+    milestone_bonus: tuple[float, ...]
+    milestone_bonus_c: tuple[int, ...]
+    history_limit: int
+
+
+def compile_config(user: Optional[dict[str, Any]] = None) -> FrozenTrackerCfg:
+    """Merge user overrides with DEFAULT_TRACKER_CONFIG once into a FrozenTrackerCfg."""
+    base = _cfg(user, "base_cashback_rate", 0.01)
+    briven = base + _cfg(user, "briven_boost_rate", 0.01)
+    gold = _cfg(user, "gold_cashback_rate", 0.03)
+    milestones = sorted(
+        ((float(k), v) for k, v in _cfg(user, "milestones", {}).items()),
+        key=lambda kv: kv[0],
+    )
+    return FrozenTrackerCfg(
+        base_rate=base,
+        briven_rate=briven,
+        gold_rate=gold,
+        base_rate_bp=_to_bp(base),
+        briven_rate_bp=_to_bp(briven),
+        gold_rate_bp=_to_bp(gold),
+        gold_threshold_c=_to_cents(_cfg(user, "gold_threshold", 1000.0)),
+        milestone_thr=tuple(thr for thr, _ in milestones),
+        milestone_thr_c=tuple(_to_cents(thr) for thr, _ in milestones),
+        milestone_next_c=tuple(_to_cents(thr) for thr, _ in milestones) + (sys.maxsize,),
+        milestone_label=tuple(info.get("label", f"Milestone {thr}") for thr, info in milestones),
+        milestone_bonus=tuple(info.get("bonus", 0.0) for _, info in milestones),
+        milestone_bonus_c=tuple(_to_cents(info.get("bonus", 0.0)) for _, info in milestones),
+        history_limit=_cfg(user, "history_limit", 100),
+    )
+
+
+_DEFAULT_CFG = compile_config(None)
+
+
+def _compiled(config: FrozenTrackerCfg | dict[str, Any] | None) -> FrozenTrackerCfg:
+    if config is None:
+        return _DEFAULT_CFG
+    if isinstance(config, FrozenTrackerCfg):
+        return config
+    return compile_config(config)
+
+
 # ---------------------------------------------------------------------------
 # Data models
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class Transaction:
+    """A recorded transaction. Monetary ``*_c`` fields are integer cents."""
     id: str
     timestamp: str
-    amount: float
-    original_amount: float
-    discount: float
-    cashback: float
+    ts_epoch: Optional[int]  # Unix seconds of timestamp (None if unparseable)
+    amount_c: int
+    original_amount_c: int
+    discount_c: int
+    cashback_c: int
     service: str
     tier: str
     category: str  # "briven" | "partner" | "other"
     rate_applied: float
-    milestone_bonus: float
-    cumulative_after: float
+    milestone_bonus_c: int
+    cumulative_after_c: int
 
     def to_dict(self) -> dict:
-        return asdict(self)
-
-
-@dataclass
+        return {
+            "id": self.id,
+            "timestamp": self.timestamp,
+            "ts_epoch": self.ts_epoch,
+            "amount": self.amount_c / 100,
+            "original_amount": self.original_amount_c / 100,
+            "discount": self.discount_c / 100,
+            "cashback": self.cashback_c / 100,
+            "service": self.service,
+            "tier": self.tier,
+            "category": self.category,
+            "rate_applied": self.rate_applied,
+            "milestone_bonus": self.milestone_bonus_c / 100,
+            "cumulative_after": self.cumulative_after_c / 100,
+        }
+
+
+@dataclass(slots=True)
 class ClaimResult:
     success: bool
     amount: float
@@ -76,13 +179,20 @@ class ClaimResult:
     error: Optional[str] = None
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        return {
+            "success": self.success,
+            "amount": self.amount,
+            "destination": self.destination,
+            "reference": self.reference,
+            "timestamp": self.timestamp,
+            "error": self.error,
+        }
 
     def to_json(self) -> str:
         return json.dumps(self.to_dict(), indent=2)
 
 
-@dataclass
+@dataclass(slots=True)
 class MonthlyStats:
     month: str  # "YYYY-MM"
     spend: float
@@ -91,10 +201,16 @@ class MonthlyStats:
     tx_count: int
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        return {
+            "month": self.month,
+            "spend": self.spend,
+            "cashback": self.cashback,
+            "bonus": self.bonus,
+            "tx_count": self.tx_count,
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class TrackerState:
     """Consolidated tracker state for dashboard rendering."""
     card_last4: str
@@ -112,18 +228,182 @@ class TrackerState:
     last_synced: str
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        return {
+            "card_last4": self.card_last4,
+            "card_status": self.card_status,
+            "tier": self.tier,
+            "cumulative_spend": self.cumulative_spend,
+            "cashback_balance": self.cashback_balance,
+            "total_earned": self.total_earned,
+            "total_discounts": self.total_discounts,
+            "tx_log": [dict(tx) for tx in self.tx_log],
+            "monthly_spend": dict(self.monthly_spend),
+            "monthly_cashback": dict(self.monthly_cashback),
+            "milestones_log": [dict(m) for m in self.milestones_log],
+            "claims_log": [dict(c) for c in self.claims_log],
+            "last_synced": self.last_synced,
+        }
 
     def to_json(self) -> str:
         return json.dumps(self.to_dict(), indent=2)
 
 
+# ---------------------------------------------------------------------------
+# Log encoding
+# ---------------------------------------------------------------------------
+
+class TxLog(deque):
+    """
+    tx_log ring buffer (newest first) that carries each entry's JSON.
+
+    json_parts holds the encoded entries in the same order; record_transaction()
+    updates both together, so the mavi:tracker:tx_log blob is a join of
+    strings instead of a re-encode of the whole log. Entries are encoded when
+    they are logged: treat them as read-only (record_transaction() returns a
+    copy of the new transaction for that reason).
+    """
+
+    def __init__(self, entries: Iterable[dict] = (), maxlen: Optional[int] = None) -> None:
+        # Entries are newest first: keep the head (a bare deque keeps the tail)
+        if maxlen is not None:
+            entries = islice(entries, maxlen)
+        super().__init__(entries, maxlen)
+        self.json_parts: deque[str] = deque(map(json.dumps, self), maxlen)
+
+    def to_json(self) -> str:
+        """Same output as json.dumps(list(self))."""
+        if len(self.json_parts) != len(self):
+            # Changed behind record_transaction()'s back (append, remove, ...)
+            self.json_parts = deque(map(json.dumps, self), self.maxlen)
+        return "[" + ", ".join(self.json_parts) + "]"
+
+
 # ---------------------------------------------------------------------------
 # Transaction recording
 # ---------------------------------------------------------------------------
 
+def _tx_kernel(
+    amount_c: int,
+    cum_before_c: int,
+    thr_arr: tuple[int, ...],
+    bonus_arr: tuple[int, ...],
+    rate_bp: int,
+) -> tuple[int, int, int, int, int]:
+    """
+    Integer-only core of a transaction.
+
+    Returns (cashback_c, milestone_bonus_c, new_cum_c, lo, hi) where
+    thr_arr[lo:hi] are the milestone thresholds crossed.
+    """
+    new_cum_c = cum_before_c + amount_c
+    lo = bisect_right(thr_arr, cum_before_c)
+    hi = bisect_right(thr_arr, new_cum_c)
+    bonus_c = sum(bonus_arr[lo:hi]) if lo < hi else 0
+    return _apply_bp(amount_c, rate_bp), bonus_c, new_cum_c, lo, hi
+
+
+def _record_transaction_fast(
+    ts: str,
+    ts_epoch: int,
+    tid: str,
+    amount_c: int,
+    orig_c: int,
+    new_cum_c: int,
+    service: str,
+    tier: str,
+    cfg: FrozenTrackerCfg,
+) -> Transaction:
+    """Common case: briven category, no discount, below gold, no milestone crossed."""
+    return Transaction(
+        id=tid,
+        timestamp=ts,
+        ts_epoch=ts_epoch,
+        amount_c=amount_c,
+        original_amount_c=orig_c,
+        discount_c=0,
+        cashback_c=_apply_bp(amount_c, cfg.briven_rate_bp),
+        service=service,
+        tier=tier,
+        category="briven",
+        rate_applied=cfg.briven_rate,
+        milestone_bonus_c=0,
+        cumulative_after_c=new_cum_c,
+    )
+
+
+def _record_transaction_general(
+    ts: str,
+    ts_epoch: int,
+    tid: str,
+    amount_c: int,
+    orig_c: int,
+    discount_c: int,
+    cum_before_c: int,
+    new_cum_c: int,
+    service: str,
+    tier: str,
+    category: str,
+    cfg: FrozenTrackerCfg,
+) -> tuple[Transaction, list[dict]]:
+    """Any transaction: picks the rate and collects crossed milestones."""
+    # Cashback rate
+    if cum_before_c >= cfg.gold_threshold_c:
+        rate, rate_bp = cfg.gold_rate, cfg.gold_rate_bp
+    elif category == "briven":
+        rate, rate_bp = cfg.briven_rate, cfg.briven_rate_bp
+    else:
+        rate, rate_bp = cfg.base_rate, cfg.base_rate_bp
+
+    cashback_c, milestone_bonus_c, _, lo, hi = _tx_kernel(
+        amount_c, cum_before_c, cfg.milestone_thr_c, cfg.milestone_bonus_c, rate_bp
+    )
+
+    # Milestones crossed: thresholds in (cum_before, new_cum]
+    triggered: list[dict] = []
+    if lo < hi:
+        new_cumulative = _from_cents(new_cum_c)
+        for i in range(lo, hi):
+            triggered.append({
+                "timestamp": ts,
+                "milestone": cfg.milestone_thr[i],
+                "label": cfg.milestone_label[i],
+                "bonus": cfg.milestone_bonus[i],
+                "cumulative_at": new_cumulative,
+            })
+
+    tx = Transaction(
+        id=tid,
+        timestamp=ts,
+        ts_epoch=ts_epoch,
+        amount_c=amount_c,
+        original_amount_c=orig_c,
+        discount_c=discount_c,
+        cashback_c=cashback_c,
+        service=service,
+        tier=tier,
+        category=category,
+        rate_applied=rate,
+        milestone_bonus_c=milestone_bonus_c,
+        cumulative_after_c=new_cum_c,
+    )
+    return tx, triggered
+
+
+def new_tx_log(
+    entries: Iterable[dict] = (),
+    config: FrozenTrackerCfg | dict[str, Any] | None = None,
+) -> TxLog:
+    """
+    Build a tx_log ring buffer (newest first) bounded by history_limit.
+
+    Pass the entries loaded from mavi:tracker:tx_log; anything beyond the
+    limit is dropped from the old end.
+    """
+    return TxLog(entries, maxlen=_compiled(config).history_limit)
+
+
 def record_transaction(
-    tx_log: list[dict],
+    tx_log: deque[dict] | list[dict],
     monthly_spend: dict[str, float],
     monthly_cashback: dict[str, float],
     milestones_log: list[dict],
@@ -140,7 +420,7 @@ def record_transaction(
     total_discounts: float = 0.0,
     tx_id: str = "",
     timestamp: str = "",
-    config: Optional[dict[str, Any]] = None,
+    config: FrozenTrackerCfg | dict[str, Any] | None = None,
     history_limit: int = 100,
 ) -> dict:
     """
@@ -148,8 +428,11 @@ def record_transaction(
 
     Parameters
     ----------
-    tx_log : list
-        Current transaction log (mutable, will be updated in place).
+    tx_log : deque or list
+        Current transaction log, newest first (mutable, updated in place).
+        A TxLog from new_tx_log() is preferred: inserts are O(1), maxlen
+        evicts the oldest entry and only the new entry is JSON-encoded.
+        Lists and unbounded deques are trimmed to history_limit.
     monthly_spend / monthly_cashback : dict
         Monthly aggregation dicts (mutable).
     milestones_log : list
@@ -166,93 +449,89 @@ def record_transaction(
         Cumulative spend before this transaction.
     cashback_balance, total_earned, total_discounts : float
         Current running totals.
-    config : dict, optional
-        Rate overrides.
+    config : FrozenTrackerCfg or dict, optional
+        Rate overrides. Pass a compile_config() result to skip merging the
+        overrides with the defaults on every call.
 
     Returns
     -------
     dict with updated totals and the new transaction record.
     """
-    ts = timestamp or _now()
+    if timestamp:
+        ts, ts_epoch = timestamp, _epoch(timestamp)
+    else:
+        ts_epoch = int(time.time())
+        ts = _now(ts_epoch)
     tid = tx_id or f"tx_{uuid.uuid4().hex[:12]}"
-    orig = original_amount if original_amount > 0 else amount + discount
 
-    # Cashback rate
-    gold_threshold = _cfg(config, "gold_threshold", 1000.0)
-    if cumulative_before >= gold_threshold:
-        rate = _cfg(config, "gold_cashback_rate", 0.03)
-    elif category == "briven":
-        rate = _cfg(config, "base_cashback_rate", 0.01) + _cfg(config, "briven_boost_rate", 0.01)
+    # All arithmetic below is in integer cents; floats only at the boundary.
+    amount_c = _to_cents(amount)
+    discount_c = _to_cents(discount)
+    cum_before_c = _to_cents(cumulative_before)
+    orig_c = _to_cents(original_amount) if original_amount > 0 else amount_c + discount_c
+    new_cum_c = cum_before_c + amount_c
+
+    cfg = _compiled(config)
+
+    if (discount_c == 0 and category == "briven" and cum_before_c < cfg.gold_threshold_c
+            and new_cum_c < cfg.milestone_next_c[bisect_right(cfg.milestone_thr_c, cum_before_c)]):
+        tx = _record_transaction_fast(ts, ts_epoch, tid, amount_c, orig_c, new_cum_c, service, tier, cfg)
+        triggered: list[dict] = []
     else:
-        rate = _cfg(config, "base_cashback_rate", 0.01)
-
-    cashback = round(amount * rate, 2)
-    new_cumulative = round(cumulative_before + amount, 2)
-
-    # Milestones
-    milestone_bonus = 0.0
-    milestones = _cfg(config, "milestones", {})
-    for thr_key, info in sorted(milestones.items(), key=lambda kv: float(kv[0])):
-        thr = float(thr_key)
-        if cumulative_before < thr <= new_cumulative:
-            bonus = info.get("bonus", 0.0)
-            milestone_bonus += bonus
-            milestones_log.append({
-                "timestamp": ts,
-                "milestone": thr,
-                "label": info.get("label", f"Milestone {thr}"),
-                "bonus": bonus,
-                "cumulative_at": new_cumulative,
-            })
-    milestone_bonus = round(milestone_bonus, 2)
+        tx, triggered = _record_transaction_general(
+            ts, ts_epoch, tid, amount_c, orig_c, discount_c, cum_before_c, new_cum_c,
+            service, tier, category, cfg,
+        )
+        milestones_log.extend(triggered)
 
-    # Transaction entry
-    tx = Transaction(
-        id=tid,
-        timestamp=ts,
-        amount=amount,
-        original_amount=orig,
-        discount=discount,
-        cashback=cashback,
-        service=service,
-        tier=tier,
-        category=category,
-        rate_applied=rate,
-        milestone_bonus=milestone_bonus,
-        cumulative_after=new_cumulative,
-    )
+    cashback_c = tx.cashback_c
+    milestone_bonus_c = tx.milestone_bonus_c
+    new_cumulative = _from_cents(new_cum_c)
 
     # Update log (newest first, enforce limit)
-    tx_log.insert(0, tx.to_dict())
-    limit = _cfg(config, "history_limit", history_limit)
-    while len(tx_log) > limit:
-        tx_log.pop()
-
-    # Monthly aggregation
-    month_key = ts[:7]  # "YYYY-MM"
-    monthly_spend[month_key] = round(monthly_spend.get(month_key, 0.0) + amount, 2)
-    monthly_cashback[month_key] = round(monthly_cashback.get(month_key, 0.0) + cashback + milestone_bonus, 2)
+    tx_dict = tx.to_dict()
+    if isinstance(tx_log, TxLog):
+        tx_log.appendleft(tx_dict)
+        tx_log.json_parts.appendleft(json.dumps(tx_dict))
+        tx_log_json = tx_log.to_json()
+    elif isinstance(tx_log, deque) and tx_log.maxlen is not None:
+        tx_log.appendleft(tx_dict)
+        tx_log_json = json.dumps(list(tx_log))
+    else:
+        tx_log.insert(0, tx_dict)
+        while len(tx_log) > cfg.history_limit:
+            tx_log.pop()
+        tx_log_json = json.dumps(list(tx_log))
+
+    # Monthly aggregation (persisted as EUR floats, summed exactly in cents).
+    # The month is the UTC month of ts_epoch, the same one get_monthly_stats()
+    # filters on; timestamps that did not parse fall back to their prefix.
+    month_key = _epoch_month(ts_epoch) if ts_epoch is not None else ts[:7]  # "YYYY-MM"
+    earned_c = cashback_c + milestone_bonus_c
+    monthly_spend[month_key] = _from_cents(_to_cents(monthly_spend.get(month_key, 0.0)) + amount_c)
+    monthly_cashback[month_key] = _from_cents(_to_cents(monthly_cashback.get(month_key, 0.0)) + earned_c)
 
     # Running totals
-    new_total_earned = round(total_earned + cashback + milestone_bonus, 2)
-    new_total_discounts = round(total_discounts + discount, 2)
-    new_cashback_balance = round(cashback_balance + cashback + milestone_bonus, 2)
+    new_total_earned = _from_cents(_to_cents(total_earned) + earned_c)
+    new_total_discounts = _from_cents(_to_cents(total_discounts) + discount_c)
+    new_cashback_balance = _from_cents(_to_cents(cashback_balance) + earned_c)
+    tier_name = "gold" if new_cum_c >= cfg.gold_threshold_c else "standard"
 
     return {
-        "transaction": tx.to_dict(),
+        "transaction": dict(tx_dict),
         "updated_totals": {
             "cumulative_spend": new_cumulative,
             "cashback_balance": new_cashback_balance,
             "total_earned": new_total_earned,
             "total_discounts": new_total_discounts,
-            "tier": "gold" if new_cumulative >= gold_threshold else "standard",
+            "tier": tier_name,
         },
-        "milestones_triggered": [m for m in milestones_log if m["timestamp"] == ts],
+        "milestones_triggered": triggered,
         "memory_updates": {
             "mavi:cumulative_spend": str(new_cumulative),
             "mavi:cashback_balance": str(new_cashback_balance),
-            "mavi:tier": "gold" if new_cumulative >= gold_threshold else "standard",
-            "mavi:tracker:tx_log": json.dumps(tx_log),
+            "mavi:tier": tier_name,
+            "mavi:tracker:tx_log": tx_log_json,
             "mavi:tracker:monthly_spend": json.dumps(monthly_spend),
             "mavi:tracker:monthly_cashback": json.dumps(monthly_cashback),
             "mavi:tracker:milestones_log": json.dumps(milestones_log),
@@ -312,48 +591,60 @@ def claim_rewards(
 # ---------------------------------------------------------------------------
 
 def get_monthly_stats(
-    tx_log: list[dict],
-    month: str,  # "YYYY-MM"
+    tx_log: Iterable[dict],
+    month: str | int,  # "YYYY-MM" or a _month_index() value
 ) -> MonthlyStats:
-    """Compute stats for a specific month from the transaction log."""
-    spend = 0.0
-    cashback = 0.0
-    bonus = 0.0
+    """
+    Compute stats for a specific month from the transaction log.
+
+    A month string that is not "YYYY-MM" matches nothing: zero stats.
+    """
+    idx = month if isinstance(month, int) else _month_index(month)
+    if idx is None:
+        return MonthlyStats(month=month, spend=0.0, cashback=0.0, bonus=0.0, tx_count=0)
+    month_str = _month_str(idx)
+    # Month as a [start, end) epoch range: one int compare per transaction
+    start = calendar.timegm((idx // 12, idx % 12 + 1, 1, 0, 0, 0))
+    end = calendar.timegm(((idx + 1) // 12, (idx + 1) % 12 + 1, 1, 0, 0, 0))
+    spend_c = 0
+    cashback_c = 0
+    bonus_c = 0
     count = 0
 
     for tx in tx_log:
-        if tx.get("timestamp", "")[:7] == month:
-            spend += tx.get("amount", 0.0)
-            cashback += tx.get("cashback", 0.0)
-            bonus += tx.get("milestone_bonus", 0.0)
+        e = tx.get("ts_epoch")
+        # Entries logged before ts_epoch existed fall back to the string prefix
+        if (start <= e < end) if e is not None else tx.get("timestamp", "")[:7] == month_str:
+            spend_c += _to_cents(tx.get("amount", 0.0))
+            cashback_c += _to_cents(tx.get("cashback", 0.0))
+            bonus_c += _to_cents(tx.get("milestone_bonus", 0.0))
             count += 1
 
     return MonthlyStats(
-        month=month,
-        spend=round(spend, 2),
-        cashback=round(cashback, 2),
-        bonus=round(bonus, 2),
+        month=month_str,
+        spend=_from_cents(spend_c),
+        cashback=_from_cents(cashback_c),
+        bonus=_from_cents(bonus_c),
         tx_count=count,
     )
 
 
 def get_milestone_proximity(
     cumulative_spend: float,
-    config: Optional[dict[str, Any]] = None,
+    config: FrozenTrackerCfg | dict[str, Any] | None = None,
 ) -> list[dict]:
     """
     Return a list of milestones with distance and completion percentage.
     """
-    milestones = _cfg(config, "milestones", {})
+    cfg = _compiled(config)
     results = []
-    for thr_key, info in sorted(milestones.items(), key=lambda kv: float(kv[0])):
-        thr = float(thr_key)
+    for thr, label, bonus in zip(cfg.milestone_thr, cfg.milestone_label, cfg.milestone_bonus):
         distance = max(0.0, round(thr - cumulative_spend, 2))
         pct = min(100.0, round((cumulative_spend / thr) * 100, 1)) if thr > 0 else 100.0
         results.append({
             "threshold": thr,
-            "label": info.get("label", f"Milestone {thr}"),
-            "bonus": info.get("bonus", 0.0),
+            "label": label,
+            "bonus": bonus,
             "distance": distance,
             "percent": pct,
             "reached": cumulative_spend >= thr,
@@ -393,8 +684,39 @@ def get_trend(
     }
 
 
-def _now() -> str:
-    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+def _now(epoch: float | None = None) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(epoch))
+
+
+def _epoch(ts: str) -> Optional[int]:
+    """ISO-8601 timestamp -> Unix seconds (naive timestamps are UTC), None if not ISO."""
+    try:
+        dt = datetime.fromisoformat(ts)
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+def _epoch_month(epoch: int) -> str:
+    """UTC "YYYY-MM" of a Unix timestamp."""
+    t = time.gmtime(epoch)
+    return f"{t.tm_year:04d}-{t.tm_mon:02d}"
+
+
+def _month_index(month: str) -> Optional[int]:
+    """Month index for "YYYY-MM": year * 12 + (month - 1), None if malformed."""
+    year, sep, mon = month[:4], month[4:5], month[5:]
+    if sep != "-" or len(year) != 4 or len(mon) != 2 or not (year + mon).isdecimal():
+        return None
+    if not 1 <= int(mon) <= 12:
+        return None
+    return int(year) * 12 + int(mon) - 1
+
+
+def _month_str(idx: int) -> str:
+    return f"{idx // 12:04d}-{idx % 12 + 1:02d}"
 
 
 # ---------------------------------------------------------------------------
@@ -404,7 +726,7 @@ def _now() -> str:
 if __name__ == "__main__":
     print("=== mavi Rewards Tracker Test ===\n")
 
-    tx_log: list[dict] = []
+    tx_log = new_tx_log()
     monthly_spend: dict[str, float] = {}
     monthly_cashback: dict[str, float] = {}
     milestones_log: list[dict] = []
@@ -0,0 +1,184 @@
+import json
+import sys
+from collections import deque
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+TRACKER_DIR = REPO_ROOT / "skills" / "mavi-rewards-tracker" / "scripts"
+if str(TRACKER_DIR) not in sys.path:
+    sys.path.insert(0, str(TRACKER_DIR))
+
+import tracker
+
+
+def _entries(n: int) -> list[dict]:
+    # As stored in mavi:tracker:tx_log: newest first
+    return [{"id": f"n{i}"} for i in range(n)]
+
+
+def test_new_tx_log_keeps_newest_entries_over_limit():
+    log = tracker.new_tx_log(_entries(5), {"history_limit": 2})
+    assert [tx["id"] for tx in log] == ["n0", "n1"]
+    assert log.to_json() == '[{"id": "n0"}, {"id": "n1"}]'
+
+
+def test_record_transaction_evicts_oldest_entry():
+    log = tracker.new_tx_log(_entries(2), {"history_limit": 2})
+    result = tracker.record_transaction(
+        log, {}, {}, [], amount=5.0, tx_id="new",
+        timestamp="2026-02-03T10:00:00Z", config={"history_limit": 2},
+    )
+    assert [tx["id"] for tx in log] == ["new", "n0"]
+    assert result["memory_updates"]["mavi:tracker:tx_log"].startswith('[{"id": "new"')
+
+
+def test_record_transaction_accepts_plain_deque():
+    log = deque(_entries(3))
+    result = tracker.record_transaction(
+        log, {}, {}, [], amount=5.0, tx_id="new",
+        timestamp="2026-02-03T10:00:00Z", config={"history_limit": 3},
+    )
+    assert [tx["id"] for tx in log] == ["new", "n0", "n1"]
+    assert json.loads(result["memory_updates"]["mavi:tracker:tx_log"]) == list(log)
+
+
+@pytest.mark.parametrize("month", ["", "2026", "2026-13", "2026-2", "Feb 2026", "2026-02-01"])
+def test_get_monthly_stats_malformed_month_is_empty(month):
+    log = [{"timestamp": "2026-02-03T10:00:00Z", "ts_epoch": 1770112800, "amount": 5.0}]
+    stats = tracker.get_monthly_stats(log, month)
+    assert stats.to_dict() == {"month": month, "spend": 0.0, "cashback": 0.0, "bonus": 0.0, "tx_count": 0}
+
+
+def _record(log, monthly_spend=None, monthly_cashback=None, milestones=None, **kwargs):
+    kwargs.setdefault("timestamp", "2026-02-03T10:00:00Z")
+    return tracker.record_transaction(
+        log,
+        {} if monthly_spend is None else monthly_spend,
+        {} if monthly_cashback is None else monthly_cashback,
+        [] if milestones is None else milestones,
+        **kwargs,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Integer-cent arithmetic
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("eur, cents", [(19.99, 1999), (0.1 + 0.2, 30), (16.15, 1615), (-2.5, -250)])
+def test_to_cents(eur, cents):
+    assert tracker._to_cents(eur) == cents
+
+
+@pytest.mark.parametrize(
+    "amount_c, rate_bp, cashback_c",
+    [(1615, 200, 32), (25, 200, 1), (24, 200, 0), (1000, 300, 30)],
+)
+def test_apply_bp_rounds_half_up(amount_c, rate_bp, cashback_c):
+    assert tracker._apply_bp(amount_c, rate_bp) == cashback_c
+
+
+def test_monthly_totals_are_summed_exactly():
+    monthly_spend: dict[str, float] = {}
+    cumulative = 0.0
+    for _ in range(10):
+        result = _record(tracker.new_tx_log(), monthly_spend, amount=0.1, cumulative_before=cumulative)
+        cumulative = result["updated_totals"]["cumulative_spend"]
+    assert monthly_spend == {"2026-02": 1.0}
+    assert cumulative == 1.0
+
+
+# ---------------------------------------------------------------------------
+# Milestones and the fast / general paths
+# ---------------------------------------------------------------------------
+
+def test_milestones_crossed_in_one_transaction():
+    milestones: list[dict] = []
+    result = _record(tracker.new_tx_log(), milestones=milestones, amount=700.0, cumulative_before=400.0)
+    assert [m["label"] for m in result["milestones_triggered"]] == ["500 Club", "Gold Status"]
+    assert milestones == result["milestones_triggered"]
+    assert result["transaction"]["milestone_bonus"] == 10.0
+    assert result["updated_totals"]["tier"] == "gold"
+
+
+@pytest.mark.parametrize(
+    "before, amount, crossed",
+    [(490.0, 10.0, ["500 Club"]), (500.0, 5.0, []), (499.99, 0.01, ["500 Club"])],
+)
+def test_milestone_threshold_is_inclusive_once(before, amount, crossed):
+    result = _record(tracker.new_tx_log(), amount=amount, cumulative_before=before)
+    assert [m["label"] for m in result["milestones_triggered"]] == crossed
+
+
+def test_gold_rate_applies_from_threshold():
+    result = _record(tracker.new_tx_log(), amount=10.0, cumulative_before=1000.0)
+    assert result["transaction"]["rate_applied"] == 0.03
+    assert result["transaction"]["cashback"] == 0.3
+
+
+@pytest.mark.parametrize("amount_c, cum_before_c", [(1, 0), (1615, 48000), (999, 40000), (5000, 60000)])
+def test_fast_path_matches_general_path(amount_c, cum_before_c):
+    cfg = tracker.compile_config(None)
+    args = ("2026-02-03T10:00:00Z", 1770112800, "tx", amount_c, amount_c)
+    new_cum_c = cum_before_c + amount_c
+    fast = tracker._record_transaction_fast(*args, new_cum_c, "svc", "pro", cfg)
+    general, triggered = tracker._record_transaction_general(
+        *args, 0, cum_before_c, new_cum_c, "svc", "pro", "briven", cfg
+    )
+    assert fast == general
+    assert triggered == []
+
+
+# ---------------------------------------------------------------------------
+# tx_log encoding
+# ---------------------------------------------------------------------------
+
+def test_tx_log_json_matches_json_dumps():
+    log = tracker.new_tx_log(_entries(3), {"history_limit": 5})
+    cumulative = 480.0
+    for i, service in enumerate(["premium", "café", "sponsor", "skill"]):
+        result = _record(
+            log, amount=10.0 + i, discount=1.0 if i % 2 else 0.0, service=service,
+            cumulative_before=cumulative, config={"history_limit": 5},
+        )
+        cumulative = result["updated_totals"]["cumulative_spend"]
+        assert result["memory_updates"]["mavi:tracker:tx_log"] == json.dumps(list(log))
+    assert len(log) == 5
+
+
+def test_tx_log_json_rebuilds_after_direct_changes():
+    log = tracker.new_tx_log(_entries(2))
+    log.append({"id": "appended"})
+    assert log.to_json() == json.dumps(list(log))
+
+
+# ---------------------------------------------------------------------------
+# Monthly aggregation by epoch month
+# ---------------------------------------------------------------------------
+
+def test_month_key_is_utc_month_of_timestamp():
+    log = tracker.new_tx_log()
+    monthly_spend: dict[str, float] = {}
+    # 23:30 at UTC-2 on Feb 28 is already March 1 in UTC
+    _record(log, monthly_spend, amount=5.0, timestamp="2026-02-28T23:30:00-02:00")
+    assert monthly_spend == {"2026-03": 5.0}
+    assert tracker.get_monthly_stats(log, "2026-03").tx_count == 1
+    assert tracker.get_monthly_stats(log, "2026-02").tx_count == 0
+
+
+def test_monthly_stats_falls_back_to_timestamp_prefix():
+    # Entries logged before ts_epoch existed
+    log = [
+        {"timestamp": "2026-02-03T10:00:00Z", "amount": 16.15, "cashback": 0.32, "milestone_bonus": 10.0},
+        {"timestamp": "2026-01-30T10:00:00Z", "amount": 5.0, "cashback": 0.1, "milestone_bonus": 0.0},
+    ]
+    stats = tracker.get_monthly_stats(log, "2026-02")
+    assert (stats.spend, stats.cashback, stats.bonus, stats.tx_count) == (16.15, 0.32, 10.0, 1)
+
+
+def test_unparseable_timestamp_does_not_crash():
+    monthly_spend: dict[str, float] = {}
+    result = _record(tracker.new_tx_log(), monthly_spend, amount=5.0, timestamp="yesterday")
+    assert result["transaction"]["ts_epoch"] is None
+    assert monthly_spend == {"yesterday"[:7]: 5.0}
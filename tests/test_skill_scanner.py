@@ -0,0 +1,178 @@
+import hashlib
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from tools import skill_scanner as scanner
+
+
+def _reference_matches(content: bytes) -> dict:
+    """What _match_patterns must return: a plain finditer per pattern."""
+    found = {}
+    for idx, (pattern, _severity, _description) in enumerate(scanner.DANGEROUS_PATTERNS):
+        matches = list(pattern.finditer(content))
+        if not matches:
+            continue
+        lines = []
+        for m in matches:
+            line = content.count(b"\n", 0, m.start()) + 1
+            if len(lines) < scanner.MAX_FINDING_LINES and (not lines or lines[-1] != line):
+                lines.append(line)
+        found[idx] = (len(matches), lines)
+    return found
+
+
+# Fragments for the fuzz corpus: every anchor literal, near misses, and the
+# separators the patterns care about (word boundaries, newlines, quotes).
+_FRAGMENTS = [
+    lit.decode("ascii") for lit in scanner._ANCHORS
+] + [
+    "subprocess.run", "subprocess.Popen", "os.system", "os.execvpe", "os.setuid",
+    "os.environ['API_KEY']", "os.environ.get('TOKEN')", "eval (", "exec(", "__import__(",
+    "compile(src, 'f', 'exec')", "open('/etc/passwd')", "open( \"/proc/1\")",
+    "requests.post", "httpx.Client", "socket.socket", "pickle.load", "cPickle.loads",
+    "marshall.loads", "codecs.decode(s, 'rot13')", "base64.b64decode", "ctypes.cdll",
+    "\\x41\\x42\\x43", "\\x4", "\\x41\\x42", "keyring", "paramiko", "shutil.rmtree",
+    "myeval(", "xos.system", "evaluate(", "os.", "subprocess.", "\\x",
+    " ", " ", "\n", "\n", "\t", "(", "'", '"', "_", "a", "Z", "0", ".",
+]
+
+
+def _fuzz_case(rng: random.Random) -> bytes:
+    return "".join(rng.choice(_FRAGMENTS) for _ in range(rng.randint(0, 60))).encode("ascii")
+
+
+@pytest.mark.parametrize(
+    "pattern, literal",
+    [
+        (r"\beval\s*\(", "eval"),
+        (r"\bsubprocess\.(call|run|Popen|check_output|check_call)\b", "subprocess."),
+        (r"\bos\.set(uid|gid|euid|egid)\b", "os.set"),
+        (r"\bpickle\.loads?\b", "pickle.load"),
+        (r"\\x[0-9a-fA-F]{2}(?:\\x[0-9a-fA-F]{2}){2,}", "\\x"),
+        (r"\bopen\s*\(\s*['\"]/(etc|proc|sys|dev)/", "open"),
+        (r"a|b", ""),
+        (r"ab*c", "a"),
+    ],
+)
+def test_literal_prefix(pattern, literal):
+    assert scanner._literal_prefix(pattern) == literal
+
+
+def test_every_pattern_is_anchored_or_run_in_full():
+    anchored = {idx for idxs in scanner._ANCHORS.values() for idx in idxs}
+    assert anchored | set(scanner._UNANCHORED) == set(range(len(scanner.DANGEROUS_PATTERNS)))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_match_patterns_equals_finditer_fuzz(seed):
+    rng = random.Random(seed)
+    for _ in range(600):
+        content = _fuzz_case(rng)
+        assert scanner._match_patterns(content) == _reference_matches(content), content
+
+
+def test_match_patterns_equals_finditer_on_repo_sources():
+    sources = sorted((REPO_ROOT / "tools").glob("*.py")) + sorted((REPO_ROOT / "python" / "tools").glob("*.py"))
+    assert sources
+    for path in sources:
+        content = path.read_bytes()
+        assert scanner._match_patterns(content) == _reference_matches(content), path
+
+
+def test_match_patterns_caps_reported_lines():
+    content = b"eval(x)\n" * (scanner.MAX_FINDING_LINES + 5)
+    [(idx, (count, lines))] = scanner._match_patterns(content).items()
+    assert scanner.DANGEROUS_PATTERNS[idx][2].startswith("eval()")
+    assert count == scanner.MAX_FINDING_LINES + 5
+    assert lines == list(range(1, scanner.MAX_FINDING_LINES + 1))
+
+
+def test_hash_and_prescan_sees_literal_across_chunk_boundary():
+    size = scanner.HASH_CHUNK_SIZE
+    content = b"#" * (size - 2) + b"eval(x)\n"
+    digest, first = scanner._hash_and_prescan(content)
+    assert digest == hashlib.sha256(content).hexdigest()
+    assert first == size - 2
+    assert scanner._match_patterns(content, first) == _reference_matches(content)
+
+
+def test_match_patterns_across_literal_search_windows():
+    # With pyahocorasick the literal search runs in HASH_CHUNK_SIZE windows
+    size = scanner.HASH_CHUNK_SIZE
+    content = (
+        b"#" * (size - 3) + b"os.setuid(0)\n"
+        + b"x" * (size - 5) + b"subprocess.run\n"
+        + b"eval(1)\n"
+    )
+    assert scanner._match_patterns(content) == _reference_matches(content)
+    assert scanner._match_patterns(content, size - 3) == _reference_matches(content)
+
+
+def test_hash_and_prescan_without_literals():
+    content = b"print('hello')\n" * 100
+    assert scanner._hash_and_prescan(content) == (hashlib.sha256(content).hexdigest(), None)
+    assert scanner._match_patterns(content, None) == {}
+
+
+# ---------------------------------------------------------------------------
+# Oversized and binary files must never come back clean
+# ---------------------------------------------------------------------------
+
+_PAYLOAD = b"import os\nos.system('rm -rf ~')\neval(input())\n"
+
+
+@pytest.fixture
+def isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(scanner, "CACHE_PATH", tmp_path / "cache" / "skill_scan_cache.sqlite")
+    monkeypatch.delenv("VIRUSTOTAL_API_KEY", raising=False)
+    return tmp_path
+
+
+def _skill(root: Path, name: str, content: bytes) -> Path:
+    skill = root / "skill"
+    skill.mkdir()
+    (skill / name).write_bytes(content)
+    return skill
+
+
+def test_oversized_file_is_still_pattern_scanned(isolated_cache):
+    skill = _skill(isolated_cache, "big.py", _PAYLOAD + b"#" + b"x" * (3 * 1024 * 1024) + b"\n")
+    assert scanner.scan_skill(skill, use_vt=False)["verdict"] == "blocked"
+    assert scanner.check_skill_safe(skill)[0] is False
+
+
+def test_binary_file_with_payload_is_blocked(isolated_cache):
+    skill = _skill(isolated_cache, "nul.py", b"\x00" + _PAYLOAD)
+    assert scanner.scan_skill(skill, use_vt=False)["verdict"] == "blocked"
+    assert scanner.check_skill_safe(skill)[0] is False
+
+
+def test_binary_file_without_payload_is_a_warning(isolated_cache):
+    skill = _skill(isolated_cache, "blob.py", b"\x7fELF\x02\x01\x00\x00" + b"\x00" * 64)
+    assert scanner.scan_skill(skill, use_vt=False)["verdict"] == "warning"
+    assert scanner.check_skill_safe(skill, strict=True)[0] is False
+
+
+@pytest.mark.parametrize("encoding", ["utf-16", "utf-16-be", "utf-32"])
+def test_wide_text_script_with_bom_is_decoded(isolated_cache, encoding):
+    text = "Write-Host 'hello'\r\nGet-ChildItem\r\n"
+    bom = {"utf-16-be": "\ufeff"}.get(encoding, "")
+    skill = _skill(isolated_cache, "run.ps1", (bom + text).encode(encoding))
+    assert scanner.scan_skill(skill, use_vt=False)["verdict"] == "clean"
+    assert scanner.check_skill_safe(skill, strict=True)[0] is True
+
+
+def test_wide_text_script_with_payload_is_blocked(isolated_cache):
+    skill = _skill(isolated_cache, "run.py", _PAYLOAD.decode("ascii").encode("utf-16"))
+    result = scanner.scan_skill(skill, use_vt=False)
+    assert result["verdict"] == "blocked"
+    [file_result] = result["results"]
+    [finding] = [f for f in file_result["static"]["findings"] if f["pattern"] == "OS command execution"]
+    assert finding["lines"] == [2]
@@ -0,0 +1,117 @@
+import copy
+import io
+import sys
+import urllib.error
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from tools import tailscale
+
+
+class _Stop(Exception):
+    pass
+
+
+def test_watch_acl_retries_failed_apply_on_unchanged_netmap(monkeypatch):
+    notify = {"NetMap": {"SelfNode": {"StableID": "self", "Addresses": ["100.64.0.1/32"]}}}
+    connects = []
+    applies = []
+
+    def fake_bus(path):
+        connects.append(path)
+        if len(connects) > 3:
+            raise _Stop
+        yield from (notify, notify, notify)
+
+    def fake_apply():
+        applies.append(1)
+        if len(applies) == 1:
+            raise OSError("HTTP 503")
+        return "applied"
+
+    monkeypatch.setattr(tailscale, "_daemon_socket_path", lambda: "/run/tailscaled.sock")
+    monkeypatch.setattr(tailscale, "_watch_ipn_bus", fake_bus)
+    monkeypatch.setattr(tailscale, "apply_briven_acl", fake_apply)
+    monkeypatch.setattr(tailscale.time, "sleep", lambda s: None)
+
+    try:
+        tailscale.watch_acl()
+    except _Stop:
+        pass
+
+    # Failed once, retried after reconnecting, then left alone while unchanged
+    assert len(applies) == 2
+
+
+class _FakeAclApi:
+    """Stands in for _api_request: serves GET/POST on the ACL with ETags."""
+
+    def __init__(self, policies, post_statuses):
+        self.policies = list(policies)  # policy returned by each successive GET
+        self.post_statuses = list(post_statuses)
+        self.gets = 0
+        self.posts = []
+
+    def __call__(self, method, url, api_key, payload=None, extra_headers=None):
+        if method == "GET":
+            policy = self.policies[min(self.gets, len(self.policies) - 1)]
+            self.gets += 1
+            return copy.deepcopy(policy), {"ETag": f'"v{self.gets}"'}
+        self.posts.append((payload, (extra_headers or {}).get("If-Match")))
+        status = self.post_statuses.pop(0)
+        if status != 200:
+            raise urllib.error.HTTPError(url, status, "Precondition Failed", {}, io.BytesIO(b""))
+        return payload, {}
+
+
+@pytest.fixture
+def acl_api(monkeypatch):
+    monkeypatch.setattr(tailscale, "_get_api_key", lambda: "tskey-api-test")
+    monkeypatch.setattr(tailscale, "_get_tailnet", lambda: "-")
+
+    def install(policies, post_statuses):
+        api = _FakeAclApi(policies, post_statuses)
+        monkeypatch.setattr(tailscale, "_api_request", api)
+        return api
+
+    return install
+
+
+_OTHER_RULE = {"action": "accept", "src": ["group:ops"], "dst": ["tag:db:5432"]}
+
+
+def test_apply_acl_refetches_and_remerges_after_412(acl_api):
+    edited = {"acls": [_OTHER_RULE], "groups": {"group:ops": ["ops@example.com"]}}
+    api = acl_api([{"acls": []}, edited], [412, 200])
+
+    assert tailscale.apply_briven_acl().startswith("Briven ACL applied")
+
+    assert api.gets == 2
+    [(_, first_etag), (merged, second_etag)] = api.posts
+    assert (first_etag, second_etag) == ('"v1"', '"v2"')
+    # The retry merged into the policy as edited, not the stale copy
+    assert _OTHER_RULE in merged["acls"]
+    assert merged["groups"] == edited["groups"]
+    assert tailscale._acl_already_applied(merged)
+
+
+def test_apply_acl_stops_when_refetched_policy_already_has_rules(acl_api):
+    applied = tailscale._merge_briven_acl({"acls": [_OTHER_RULE]})
+    api = acl_api([{"acls": [_OTHER_RULE]}, applied], [412])
+
+    assert "already applied" in tailscale.apply_briven_acl()
+    assert len(api.posts) == 1
+
+
+def test_apply_acl_gives_up_after_second_412(acl_api):
+    api = acl_api([{"acls": []}], [412, 412])
+
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        tailscale.apply_briven_acl()
+    assert excinfo.value.code == 412
+    assert len(api.posts) == 2
@@ -12,10 +12,57 @@ Docs: https://discord.com/developers/docs/resources/webhook#execute-webhook
 """
 
 import argparse
+import atexit
 import json
 import os
 import sys
-import urllib.request
+import threading
+
+try:
+    from tools.http_keepalive import KeepAliveClient
+except ImportError:  # run as a script from inside tools/
+    from http_keepalive import KeepAliveClient
+
+_HEADERS = {"Content-Type": "application/json"}
+
+# Hard cap on any response body. Success bodies (message objects with
+# ?wait=true, which can be large for embeds) are used in full; error text
+# is trimmed to _MAX_ERROR_BYTES for the exception message.
+_MAX_BODY_BYTES = 1024 * 1024
+_MAX_ERROR_BYTES = 4096
+
+# Shared keep-alive client, created on first send and closed at exit
+_CLIENT: KeepAliveClient | None = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def _get_client() -> KeepAliveClient:
+    global _CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            _CLIENT = KeepAliveClient(timeout=10)
+            atexit.register(_CLIENT.close)
+        return _CLIENT
+
+
+def _post_webhook(url: str, payload: dict) -> dict:
+    """POST a JSON payload to a webhook URL over a pooled connection."""
+    data = json.dumps(payload).encode("utf-8")
+    try:
+        status, raw = _get_client().post(url, data, _HEADERS, max_bytes=_MAX_BODY_BYTES)
+    except ValueError:
+        raise ValueError(f"Invalid Discord webhook URL: {url}") from None
+
+    # Discord returns 204 No Content on success
+    if status == 204:
+        return {"ok": True}
+    body = raw.decode("utf-8", errors="replace")
+    if status >= 400:
+        raise RuntimeError(f"Discord API error {status}: {body[:_MAX_ERROR_BYTES]}")
+    try:
+        return json.loads(body)
+    except json.JSONDecodeError:
+        return {"ok": status < 300, "response": body}
 
 
 def send_message(
@@ -32,22 +79,33 @@ def send_message(
     if username:
         payload["username"] = username
 
-    data = json.dumps(payload).encode("utf-8")
-    req = urllib.request.Request(
-        url,
-        data=data,
-        headers={"Content-Type": "application/json"},
-        method="POST",
+    return _post_webhook(url, payload)
+
+
+def send_message_async(
+    message: str,
+    webhook_url: str | None = None,
+    username: str | None = None,
+) -> None:
+    """Queue a message for background delivery and return immediately.
+
+    Failures are logged by the worker; call notify_queue.flush() before
+    shutdown to make sure pending messages went out.
+    """
+    url = webhook_url or os.environ.get("DISCORD_WEBHOOK_URL")
+    if not url:
+        raise ValueError("DISCORD_WEBHOOK_URL not set in environment or .env")
+    _notify_queue().submit(
+        send_message, message=message, webhook_url=url, username=username
     )
-    with urllib.request.urlopen(req, timeout=10) as resp:
-        # Discord returns 204 No Content on success
-        if resp.status == 204:
-            return {"ok": True}
-        body = resp.read().decode("utf-8")
-        try:
-            return json.loads(body)
-        except json.JSONDecodeError:
-            return {"ok": resp.status < 300, "response": body}
+
+
+def _notify_queue():
+    try:
+        from tools.notify_queue import get_queue
+    except ImportError:  # run as a script from inside tools/
+        from notify_queue import get_queue
+    return get_queue("discord")
 
 
 def send_embed(
@@ -72,21 +130,7 @@ def send_embed(
     if username:
         payload["username"] = username
 
-    data = json.dumps(payload).encode("utf-8")
-    req = urllib.request.Request(
-        url,
-        data=data,
-        headers={"Content-Type": "application/json"},
-        method="POST",
-    )
-    with urllib.request.urlopen(req, timeout=10) as resp:
-        if resp.status == 204:
-            return {"ok": True}
-        body = resp.read().decode("utf-8")
-        try:
-            return json.loads(body)
-        except json.JSONDecodeError:
-            return {"ok": resp.status < 300, "response": body}
+    return _post_webhook(url, payload)
 
 
 def main() -> None:
@@ -18,18 +18,14 @@ from email.mime.text import MIMEText
 from pathlib import Path
 
 
-def send_email(
-    to: str,
-    subject: str,
-    body: str,
-    from_addr: str | None = None,
-    smtp_host: str | None = None,
-    smtp_port: int | None = None,
-    username: str | None = None,
-    password: str | None = None,
-    html: bool = False,
-) -> None:
-    """Send an email via SMTP with TLS."""
+def _resolve_settings(
+    from_addr: str | None,
+    smtp_host: str | None,
+    smtp_port: int | None,
+    username: str | None,
+    password: str | None,
+) -> tuple[str, int, str, str, str]:
+    """Merge explicit arguments with .env settings: (host, port, user, password, from)."""
     _host = smtp_host or os.environ.get("EMAIL_SMTP_HOST", "smtp.gmail.com")
     _port = smtp_port or int(os.environ.get("EMAIL_SMTP_PORT", "587"))
     _user = username or os.environ.get("EMAIL_USER")
@@ -38,20 +34,126 @@ def send_email(
 
     if not _user or not _pass:
         raise ValueError("EMAIL_USER and EMAIL_PASSWORD must be set in .env")
+    return _host, _port, _user, _pass, _from
 
+
+def _build_message(to: str, subject: str, body: str, from_addr: str, html: bool) -> str:
     msg = MIMEMultipart("alternative")
     msg["Subject"] = subject
-    msg["From"] = _from
+    msg["From"] = from_addr
     msg["To"] = to
 
     mime_type = "html" if html else "plain"
     msg.attach(MIMEText(body, mime_type, "utf-8"))
+    return msg.as_string()
+
 
-    with smtplib.SMTP(_host, _port, timeout=15) as server:
+def _connect(host: str, port: int, user: str, password: str) -> smtplib.SMTP:
+    server = smtplib.SMTP(host, port, timeout=15)
+    try:
         server.ehlo()
         server.starttls()
-        server.login(_user, _pass)
-        server.sendmail(_from, [to], msg.as_string())
+        server.login(user, password)
+    except Exception:
+        server.close()
+        raise
+    return server
+
+
+def send_email(
+    to: str,
+    subject: str,
+    body: str,
+    from_addr: str | None = None,
+    smtp_host: str | None = None,
+    smtp_port: int | None = None,
+    username: str | None = None,
+    password: str | None = None,
+    html: bool = False,
+) -> None:
+    """Send an email via SMTP with TLS."""
+    _host, _port, _user, _pass, _from = _resolve_settings(
+        from_addr, smtp_host, smtp_port, username, password
+    )
+    message = _build_message(to, subject, body, _from, html)
+
+    with _connect(_host, _port, _user, _pass) as server:
+        server.sendmail(_from, [to], message)
+
+
+# Open connection owned by the background email worker (only touched on that thread)
+_worker_conn: smtplib.SMTP | None = None
+_worker_conn_key: tuple[str, int, str] | None = None
+
+
+def _send_email_pooled(
+    to: str,
+    subject: str,
+    body: str,
+    settings: tuple[str, int, str, str, str],
+    html: bool = False,
+) -> None:
+    """Send on the worker's open SMTP connection, reconnecting when it drops."""
+    global _worker_conn, _worker_conn_key
+    _host, _port, _user, _pass, _from = settings
+    message = _build_message(to, subject, body, _from, html)
+    key = (_host, _port, _user)
+
+    if _worker_conn is not None and _worker_conn_key != key:
+        _close_worker_conn()
+    for attempt in range(2):
+        if _worker_conn is None:
+            _worker_conn = _connect(_host, _port, _user, _pass)
+            _worker_conn_key = key
+        try:
+            _worker_conn.sendmail(_from, [to], message)
+            return
+        except smtplib.SMTPServerDisconnected:
+            _close_worker_conn()
+            if attempt:
+                raise
+
+
+def _close_worker_conn() -> None:
+    global _worker_conn, _worker_conn_key
+    if _worker_conn is not None:
+        try:
+            _worker_conn.quit()
+        except Exception:
+            _worker_conn.close()
+    _worker_conn = None
+    _worker_conn_key = None
+
+
+def send_email_async(
+    to: str,
+    subject: str,
+    body: str,
+    from_addr: str | None = None,
+    smtp_host: str | None = None,
+    smtp_port: int | None = None,
+    username: str | None = None,
+    password: str | None = None,
+    html: bool = False,
+) -> None:
+    """Queue an email for background delivery and return immediately.
+
+    The email worker keeps its SMTP connection open between messages.
+    Failures are logged by the worker; call notify_queue.flush() before
+    shutdown to make sure pending emails went out.
+    """
+    settings = _resolve_settings(from_addr, smtp_host, smtp_port, username, password)
+    _notify_queue().submit(
+        _send_email_pooled, to=to, subject=subject, body=body, settings=settings, html=html
+    )
+
+
+def _notify_queue():
+    try:
+        from tools.notify_queue import get_queue
+    except ImportError:  # run as a script from inside tools/
+        from notify_queue import get_queue
+    return get_queue("email")
 
 
 def main() -> None:
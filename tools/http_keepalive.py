@@ -0,0 +1,201 @@
+"""
+tools/http_keepalive.py — Keep-alive HTTPS client shared by Briven's notifiers.
+
+urllib.request opens a new TCP + TLS connection for every call. This client
+keeps HTTPSConnections open between calls (a small idle pool per host), so
+bursts of notifications pay the handshake once per connection. Like
+urllib, it honours HTTPS_PROXY/NO_PROXY (tunnelling through CONNECT). Every
+notifier (Discord, Slack, Telegram, WhatsApp) and the Tailscale API
+helpers send through it.
+
+Usage:
+    from tools.http_keepalive import KeepAliveClient
+    client = KeepAliveClient(timeout=10)
+    status, body = client.post_json("https://api.example.com/x", {"a": 1})
+"""
+
+import base64
+import http.client
+import json
+import threading
+import time
+import urllib.parse
+import urllib.request
+from collections.abc import Iterable
+
+try:
+    import orjson  # optional: pip install orjson
+except ImportError:
+    orjson = None
+
+# Errors that mean a reused keep-alive connection was closed by the server
+STALE_CONN_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+# Upper bound on one retry wait, whatever Retry-After asks for
+MAX_RETRY_DELAY = 30.0
+
+
+def _retry_delay(headers: http.client.HTTPMessage, attempt: int) -> float:
+    """Seconds to wait before retry `attempt`: Retry-After, else exponential backoff."""
+    try:
+        delay = float(headers.get("Retry-After", ""))
+    except ValueError:
+        delay = 0.5 * 2 ** attempt
+    return min(max(delay, 0.0), MAX_RETRY_DELAY)
+
+
+def json_bytes(payload: dict) -> bytes:
+    """Encode payload as compact UTF-8 JSON (orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+def _https_proxy(host: str) -> urllib.parse.SplitResult | None:
+    """The proxy urllib would use for https://host (None: connect directly)."""
+    proxy = urllib.request.getproxies().get("https")
+    if not proxy or urllib.request.proxy_bypass(host):
+        return None
+    if "://" not in proxy:
+        proxy = f"http://{proxy}"
+    return urllib.parse.urlsplit(proxy)
+
+
+class KeepAliveClient:
+    """
+    HTTPS requests over pooled keep-alive connections. Idle connections are
+    kept per (host, port) and handed to one request at a time, so several
+    threads can send concurrently, each on its own connection.
+    """
+
+    def __init__(self, timeout: float = 10, max_idle: int = 8) -> None:
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self._idle: dict[tuple[str, int | None], list[http.client.HTTPSConnection]] = {}
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        with self._lock:
+            for conns in self._idle.values():
+                for conn in conns:
+                    conn.close()
+            self._idle.clear()
+
+    def _checkout(self, parts: urllib.parse.SplitResult) -> tuple[http.client.HTTPSConnection, bool]:
+        """An idle connection to the URL's host (reused=True), or a new one."""
+        with self._lock:
+            conns = self._idle.get((parts.hostname, parts.port))
+            if conns:
+                return conns.pop(), True
+        return self._connect(parts), False
+
+    def _connect(self, parts: urllib.parse.SplitResult) -> http.client.HTTPSConnection:
+        """A new connection to the URL's host, through the https proxy if one applies."""
+        proxy = _https_proxy(parts.hostname)
+        if proxy is None:
+            return http.client.HTTPSConnection(parts.hostname, parts.port, timeout=self.timeout)
+        conn = http.client.HTTPSConnection(proxy.hostname, proxy.port or 80, timeout=self.timeout)
+        tunnel_headers = {}
+        if proxy.username:
+            creds = urllib.parse.unquote(f"{proxy.username}:{proxy.password or ''}")
+            token = base64.b64encode(creds.encode("utf-8")).decode("ascii")
+            tunnel_headers["Proxy-Authorization"] = f"Basic {token}"
+        conn.set_tunnel(parts.hostname, parts.port, headers=tunnel_headers)
+        return conn
+
+    def _checkin(self, parts: urllib.parse.SplitResult, conn: http.client.HTTPSConnection) -> None:
+        with self._lock:
+            conns = self._idle.setdefault((parts.hostname, parts.port), [])
+            if len(conns) < self.max_idle:
+                conns.append(conn)
+                return
+        conn.close()
+
+    def _send(
+        self, method: str, parts: urllib.parse.SplitResult, path: str,
+        data: bytes | Iterable[bytes] | None, headers: dict,
+        max_bytes: int | None = None, timeout: float | None = None,
+    ) -> tuple[int, http.client.HTTPMessage, bytes]:
+        conn, reused = self._checkout(parts)
+        while True:
+            # Pooled connections carry the timeout of whoever used them last
+            conn.timeout = self.timeout if timeout is None else timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(conn.timeout)
+            try:
+                conn.request(method, path, body=data, headers=headers)
+                resp = conn.getresponse()
+            except Exception as e:
+                conn.close()
+                # Retry once on a fresh socket if the idle one had gone stale;
+                # no response was read, so the server did not handle the request
+                if not (reused and isinstance(e, STALE_CONN_ERRORS)):
+                    raise
+                conn = self._connect(parts)
+                reused = False
+                continue
+            break
+        try:
+            body = resp.read() if max_bytes is None else resp.read(max_bytes + 1)
+        except Exception:
+            conn.close()
+            raise
+        if max_bytes is not None and len(body) > max_bytes:
+            # Rest of the body is unread, so the connection can't be reused
+            conn.close()
+            raise RuntimeError(f"Response body from {parts.hostname} exceeds {max_bytes} bytes")
+        if resp.will_close:
+            conn.close()
+        else:
+            self._checkin(parts, conn)
+        return resp.status, resp.headers, body
+
+    def request(
+        self, method: str, url: str, data: bytes | Iterable[bytes] | None = None,
+        headers: dict | None = None, retries: int = 0, max_bytes: int | None = None,
+        timeout: float | None = None,
+    ) -> tuple[int, http.client.HTTPMessage, bytes]:
+        """
+        Send a request to an https URL; returns (status, headers, body). On
+        429 or 5xx the request is retried up to `retries` times, waiting for
+        Retry-After (or exponential backoff) in between. A body larger than
+        `max_bytes` raises RuntimeError instead of being buffered.
+
+        `data` may be an iterable of chunks to stream a large body (set
+        Content-Length in `headers`); it must be iterable more than once, as
+        any retry sends it again. `timeout` overrides the client's for this
+        call.
+        """
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme != "https" or not parts.hostname:
+            raise ValueError(f"Invalid URL: {url}")
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+
+        attempt = 0
+        while True:
+            status, resp_headers, body = self._send(
+                method, parts, path, data, headers or {}, max_bytes, timeout
+            )
+            if attempt < retries and (status == 429 or status >= 500):
+                time.sleep(_retry_delay(resp_headers, attempt))
+                attempt += 1
+                continue
+            return status, resp_headers, body
+
+    def post(
+        self, url: str, data: bytes, headers: dict, retries: int = 0,
+        max_bytes: int | None = None,
+    ) -> tuple[int, bytes]:
+        """POST data to an https URL; returns (status, body). See request()."""
+        status, _, body = self.request("POST", url, data, headers, retries, max_bytes)
+        return status, body
+
+    def post_json(
+        self, url: str, payload: dict, headers: dict | None = None, retries: int = 0
+    ) -> tuple[int, bytes]:
+        """POST payload as JSON; returns (status, body)."""
+        hdrs = {"Content-Type": "application/json"}
+        if headers:
+            hdrs.update(headers)
+        return self.post(url, json_bytes(payload), hdrs, retries)
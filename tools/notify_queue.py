@@ -0,0 +1,94 @@
+"""
+tools/notify_queue.py — Fire-and-forget notification queue for Briven.
+
+Notifications (Discord, email, ...) are not on the agent's critical path,
+so senders can hand them to a background worker and return immediately.
+Each named queue is drained by a single daemon thread, which keeps calls
+ordered and lets a sender hold per-thread state (e.g. an open SMTP
+connection) between messages.
+
+Usage:
+    from tools.notify_queue import get_queue, flush
+    get_queue("discord").submit(send_message, message="Task complete")
+    flush(timeout=5)  # before shutdown
+"""
+
+import atexit
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable
+
+logger = logging.getLogger("briven.notify")
+
+# Seconds to wait for pending notifications when the interpreter exits
+EXIT_FLUSH_TIMEOUT = 5.0
+
+
+class NotifyQueue:
+    """A queue of (fn, kwargs) jobs drained by one daemon worker thread."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._q: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._worker, name=f"notify-{name}", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, fn: Callable[..., Any], **kwargs: Any) -> None:
+        """Enqueue fn(**kwargs) to run on the worker thread."""
+        self._q.put((fn, kwargs))
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until all queued jobs ran. Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._q.all_tasks_done:
+            while self._q.unfinished_tasks:
+                if deadline is None:
+                    self._q.all_tasks_done.wait()
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._q.all_tasks_done.wait(remaining):
+                    return False
+        return True
+
+    def _worker(self) -> None:
+        while True:
+            fn, kwargs = self._q.get()
+            try:
+                fn(**kwargs)
+            except Exception as e:
+                logger.warning("[notify:%s] %s failed: %s", self.name, getattr(fn, "__name__", fn), e)
+            finally:
+                self._q.task_done()
+
+
+_QUEUES: dict[str, NotifyQueue] = {}
+_QUEUES_LOCK = threading.Lock()
+
+
+def get_queue(name: str) -> NotifyQueue:
+    """Return the shared queue for a channel, starting its worker on first use."""
+    with _QUEUES_LOCK:
+        q = _QUEUES.get(name)
+        if q is None:
+            q = _QUEUES[name] = NotifyQueue(name)
+        return q
+
+
+def flush(timeout: float | None = None) -> bool:
+    """Wait for every queue to drain. Returns False if any timed out."""
+    with _QUEUES_LOCK:
+        queues = list(_QUEUES.values())
+    deadline = None if timeout is None else time.monotonic() + timeout
+    ok = True
+    for q in queues:
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        ok = q.flush(remaining) and ok
+    return ok
+
+
+# Daemon workers die with the interpreter — give queued messages a chance first
+atexit.register(flush, EXIT_FLUSH_TIMEOUT)
@@ -8,8 +8,8 @@ Scans skill files before they are loaded into the agent, using two layers:
   2. VirusTotal API — hash-based lookup (no file upload by default)
      to catch known-malicious payloads that bypass pattern matching.
 
-Results are cached in data/skill_scan_cache.json so unchanged files
-are not re-scanned on every load.
+Results are cached in data/skill_scan_cache.sqlite (one row per file
+hash) so unchanged files are not re-scanned on every load.
 
 Usage:
     python tools/skill_scanner.py --path skills/my-skill/
@@ -29,26 +29,64 @@ Output:
 """
 
 import argparse
+import atexit
+import codecs
 import hashlib
+import http.client
 import json
+import mmap
 import os
 import re
+import sqlite3
 import sys
+import threading
 import time
-import urllib.request
-import urllib.error
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+try:
+    import ahocorasick  # optional: pip install pyahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    from tools.http_keepalive import KeepAliveClient
+except ImportError:  # run as a script from inside tools/
+    from http_keepalive import KeepAliveClient
 
 # ---------------------------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------------------------
 
-CACHE_PATH = Path(__file__).parent.parent / "data" / "skill_scan_cache.json"
+CACHE_PATH = Path(__file__).parent.parent / "data" / "skill_scan_cache.sqlite"
 
 VT_API_BASE = "https://www.virustotal.com/api/v3"
 
+# VT free tier: at most VT_RATE_LIMIT requests per VT_RATE_WINDOW seconds
+VT_RATE_LIMIT = 4
+VT_RATE_WINDOW = 60.0
+
+# Leading bytes sniffed for NUL to tell binary files from source. Binary
+# content is still pattern-scanned (a NUL must not hide a payload), but it
+# never counts as clean: a script file is not expected to contain NULs.
+BINARY_SNIFF_BYTES = 4096
+
+# Byte-order marks of wide text encodings (UTF-32 first: its LE mark starts
+# with UTF-16's). PowerShell and batch scripts are often saved as UTF-16;
+# such files are decoded before scanning so they are neither "binary" nor
+# able to hide a payload between NULs.
+_WIDE_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
 # Maximum file size we'll upload to VT (32 MB API limit, we cap at 5 MB)
 MAX_UPLOAD_BYTES = 5 * 1024 * 1024
 
@@ -58,15 +96,35 @@ SCANNABLE_EXTENSIONS = {
     ".rb", ".pl", ".php", ".lua", ".r", ".jl",
 }
 
-# Cache entries older than this are re-checked
+# Threads used by scan_skill for the hash + static layers
+SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Directories never descended into: VCS metadata and bytecode caches hold
+# nothing a skill executes. Vendored code (node_modules, venv) runs with
+# the skill, so it is scanned like everything else.
+SKIP_DIRS = {".git", "__pycache__"}
+
+# Cache entries older than this are re-checked. The TTL depends on what
+# VirusTotal said: a hash VT did not know yet (or a failed lookup) is
+# retried soon, a malicious verdict is kept longest, and a static-only
+# entry is re-checked within a day so VT gets asked once a key is set.
 CACHE_TTL_SECONDS = 7 * 24 * 3600  # 7 days
+CACHE_TTL_BY_VT_VERDICT = {
+    "malicious": 30 * 24 * 3600,
+    "suspicious": CACHE_TTL_SECONDS,
+    "clean": CACHE_TTL_SECONDS,
+    "unknown": 3600,
+}
+CACHE_TTL_STATIC_ONLY = 12 * 3600
 
 # ---------------------------------------------------------------------------
 # Dangerous pattern definitions (static analysis layer)
 # ---------------------------------------------------------------------------
 
-# Each entry: (pattern_regex, severity, description)
-DANGEROUS_PATTERNS: List[tuple[str, str, str]] = [
+# Each entry: (pattern_regex, severity, description). Gaps inside a pattern
+# are bounded ([^\n]{0,120}?) rather than .*, so a crafted long line cannot
+# make matching quadratic.
+_RAW_PATTERNS: List[tuple[str, str, str]] = [
     # Process execution
     (r"\bsubprocess\.(call|run|Popen|check_output|check_call)\b", "high",
      "Subprocess execution"),
@@ -79,7 +137,7 @@ DANGEROUS_PATTERNS: List[tuple[str, str, str]] = [
     (r"\beval\s*\(", "high", "eval() — arbitrary code execution"),
     (r"\bexec\s*\(", "high", "exec() — arbitrary code execution"),
     (r"\b__import__\s*\(", "high", "Dynamic import — code injection vector"),
-    (r"\bcompile\s*\(.+['\"]exec['\"]", "high",
+    (r"\bcompile\s*\([^\n]{0,120}?['\"]exec['\"]", "high",
      "compile() with exec mode"),
 
     # Network exfiltration
@@ -97,17 +155,17 @@ DANGEROUS_PATTERNS: List[tuple[str, str, str]] = [
     # File system abuse
     (r"\bopen\s*\(\s*['\"]/(etc|proc|sys|dev)/", "high",
      "Access to sensitive system paths"),
-    (r"\bos\.environ\b.*\b(KEY|TOKEN|SECRET|PASSWORD)\b", "medium",
+    (r"\bos\.environ\b[^\n]{0,120}?\b(?:KEY|TOKEN|SECRET|PASSWORD)\b", "medium",
      "Environment variable access (secrets)"),
     (r"\bkeyring\b", "medium",
      "System keyring access"),
 
     # Obfuscation / evasion
-    (r"\\x[0-9a-fA-F]{2}.*\\x[0-9a-fA-F]{2}.*\\x[0-9a-fA-F]{2}", "high",
+    (r"\\x[0-9a-fA-F]{2}(?:\\x[0-9a-fA-F]{2}){2,}", "high",
      "Hex-encoded strings (possible obfuscation)"),
     (r"\bbase64\.b64decode\b", "low",
      "Base64 decoding (check context)"),
-    (r"\bcodecs\.decode\b.*rot", "medium",
+    (r"\bcodecs\.decode\b[^\n]{0,120}?rot", "medium",
      "ROT encoding (obfuscation)"),
     (r"\bmarshall\.loads\b", "high",
      "Marshal deserialization — code execution"),
@@ -123,58 +181,389 @@ DANGEROUS_PATTERNS: List[tuple[str, str, str]] = [
      "Privilege manipulation"),
 ]
 
+# Compiled once at import as bytes patterns, so they run directly on the
+# memory-mapped file: (compiled_regex, severity, description)
+DANGEROUS_PATTERNS: List[tuple[re.Pattern, str, str]] = [
+    (re.compile(p.encode("ascii")), severity, description)
+    for p, severity, description in _RAW_PATTERNS
+]
+
+
+# ---------------------------------------------------------------------------
+# Multi-pattern matcher
+# ---------------------------------------------------------------------------
+#
+# Every pattern above starts with a fixed literal ("subprocess.", "eval",
+# "\x", ...). One pass over the file finds all literal occurrences; the full
+# regex is then only tried at those offsets, so clean files never run the
+# per-pattern regexes at all.
+
+_REGEX_META = set(".^$*+?{}[]()|\\")
+
+
+def _literal_prefix(pattern: str) -> str:
+    """
+    Literal text every match of `pattern` starts with ('' if there is none).
+
+    Conservative: skips a leading \\b, accepts escaped punctuation, stops at
+    the first class, group or assertion, and drops a char that is quantified.
+    """
+    depth = 0
+    for i, c in enumerate(pattern):
+        if c == "(" and (i == 0 or pattern[i - 1] != "\\"):
+            depth += 1
+        elif c == ")" and pattern[i - 1] != "\\":
+            depth -= 1
+        elif c == "|" and depth == 0 and pattern[i - 1] != "\\":
+            return ""  # top-level alternation: no common prefix
+
+    i = 2 if pattern.startswith(r"\b") else 0
+    out: List[str] = []
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\":
+            nxt = pattern[i + 1:i + 2]
+            if not nxt or nxt.isalnum():  # \b, \s, \d, \x.. are not literals
+                break
+            lit, step = nxt, 2
+        elif c in _REGEX_META:
+            break
+        else:
+            lit, step = c, 1
+        quant = pattern[i + step:i + step + 1]
+        if quant in ("?", "*", "{"):
+            break
+        out.append(lit)
+        if quant == "+":
+            break
+        i += step
+    return "".join(out)
+
+
+# literal -> indices of patterns anchored on it
+_ANCHORS: Dict[bytes, List[int]] = {}
+# patterns without a usable literal are always run over the whole file
+_UNANCHORED: List[int] = []
+for _idx, (_pat, _sev, _desc) in enumerate(_RAW_PATTERNS):
+    _lit = _literal_prefix(_pat)
+    if len(_lit) >= 2:
+        _ANCHORS.setdefault(_lit.encode("ascii"), []).append(_idx)
+    else:
+        _UNANCHORED.append(_idx)
+
+# A hit on a literal is also a hit on every shorter literal it starts with
+# ("os.set" implies "os."), so try those patterns too.
+_CANDIDATES: Dict[bytes, List[int]] = {
+    lit: [i for other, idxs in _ANCHORS.items() if lit.startswith(other) for i in idxs]
+    for lit in _ANCHORS
+}
+
+# pyahocorasick works on str; latin-1 maps each byte to one code point, so
+# offsets in the decoded text equal offsets in the buffer.
+if ahocorasick is not None:
+    _AUTOMATON = ahocorasick.Automaton()
+    for _lit in _ANCHORS:
+        _AUTOMATON.add_word(_lit.decode("latin-1"), _lit)
+    _AUTOMATON.make_automaton()
+else:
+    _AUTOMATON = None
+
+# Fallback: one alternation of all literals, longest first, inside a
+# lookahead so overlapping occurrences are all reported.
+_LITERAL_RE = re.compile(
+    b"(?=("
+    + b"|".join(re.escape(lit) for lit in sorted(_ANCHORS, key=len, reverse=True))
+    + b"))"
+)
+
+
+def _literal_hits(content: bytes, start: int = 0) -> List[tuple[int, bytes]]:
+    """(offset, literal) for every anchor literal in content[start:], by offset."""
+    if _AUTOMATON is not None:
+        # Decoded a window at a time, so a large mapped file is never copied
+        # whole; windows overlap by a literal so none is split, and a hit
+        # starting in the overlap is left to the next window.
+        hits = []
+        size = len(content)
+        for lo in range(start, size, HASH_CHUNK_SIZE):
+            hi = min(lo + HASH_CHUNK_SIZE + _MAX_LITERAL_LEN - 1, size)
+            for end, lit in _AUTOMATON.iter(str(content[lo:hi], "latin-1")):
+                pos = lo + end - len(lit) + 1
+                if pos < lo + HASH_CHUNK_SIZE:
+                    hits.append((pos, lit))
+        hits.sort()
+        return hits
+    return [(m.start(), m.group(1)) for m in _LITERAL_RE.finditer(content, start)]
+
+
+_NEWLINE = re.compile(b"\n")
+
+_MAX_LITERAL_LEN = max(map(len, _ANCHORS), default=1)
+
+
+def _hash_and_prescan(content: bytes) -> tuple[str, Optional[int]]:
+    """
+    SHA-256 of content and the offset of its first anchor literal (None if
+    there is none), from one pass: each HASH_CHUNK_SIZE window is searched
+    right after it is hashed, while it is still in CPU cache.
+    """
+    h = hashlib.sha256()
+    first: Optional[int] = None
+    size = len(content)
+    with memoryview(content) as view:
+        for start in range(0, size, HASH_CHUNK_SIZE):
+            end = min(start + HASH_CHUNK_SIZE, size)
+            h.update(view[start:end])
+            if first is None:
+                # Step back so a literal straddling the last window is seen
+                m = _LITERAL_RE.search(content, max(0, start - _MAX_LITERAL_LEN + 1), end)
+                if m is not None:
+                    first = m.start()
+    return h.hexdigest(), first
+
+
+# Line numbers reported per finding
+MAX_FINDING_LINES = 10
+
+
+def _match_patterns(
+    content: bytes, first: Optional[int] = -1
+) -> Dict[int, tuple[int, List[int]]]:
+    """
+    Run all DANGEROUS_PATTERNS over content in one literal pass.
+
+    `first` is the offset of the first anchor literal when the caller has
+    already searched for it (None: there is none); -1 searches here.
+
+    Returns {pattern index: (occurrences, first MAX_FINDING_LINES line
+    numbers)}; occurrences match what re.findall() would count.
+    """
+    # Pre-filter: most files contain no anchor literal at all. One search
+    # proves that; otherwise the literal pass resumes from the first hit.
+    if first == -1:
+        m = _LITERAL_RE.search(content)
+        first = m.start() if m is not None else None
+    if first is None and not _UNANCHORED:
+        return {}
+
+    # Newline offsets, built on the first hit; a match's line is then a
+    # bisect instead of a rescan of the text before it.
+    newlines: Optional[List[int]] = None
+    found: Dict[int, tuple[int, List[int]]] = {}
+    # Next offset each pattern may match at (keeps matches non-overlapping)
+    next_start = [0] * len(DANGEROUS_PATTERNS)
+
+    def record(idx: int, pos: int) -> None:
+        nonlocal newlines
+        count, lines = found.get(idx, (0, []))
+        if len(lines) < MAX_FINDING_LINES:
+            if newlines is None:
+                newlines = [m.start() for m in _NEWLINE.finditer(content)]
+            line = bisect_right(newlines, pos) + 1
+            if not lines or lines[-1] != line:
+                lines.append(line)
+        found[idx] = (count + 1, lines)
+
+    hits = _literal_hits(content, first) if first is not None else []
+    for pos, lit in hits:
+        for idx in _CANDIDATES[lit]:
+            if pos < next_start[idx]:
+                continue
+            m = DANGEROUS_PATTERNS[idx][0].match(content, pos)
+            if m is None:
+                next_start[idx] = pos + 1
+                continue
+            next_start[idx] = max(m.end(), pos + 1)
+            record(idx, pos)
+
+    for idx in _UNANCHORED:
+        for m in DANGEROUS_PATTERNS[idx][0].finditer(content):
+            record(idx, m.start())
+
+    return found
+
 
 # ---------------------------------------------------------------------------
 # Cache management
 # ---------------------------------------------------------------------------
 
-def _load_cache() -> Dict[str, Any]:
-    """Load scan cache from disk."""
-    try:
-        if CACHE_PATH.exists():
-            return json.loads(CACHE_PATH.read_text(encoding="utf-8"))
-    except Exception:
-        pass
-    return {}
+_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scan_cache (
+    sha256     TEXT PRIMARY KEY,
+    scanned_at TEXT NOT NULL,
+    verdict    TEXT,
+    vt_verdict TEXT,
+    payload    TEXT NOT NULL
+)
+"""
 
+_db: Optional[sqlite3.Connection] = None
+_db_path: Optional[Path] = None
+# One connection is shared by scan_skill's worker threads
+_db_lock = threading.Lock()
 
-def _save_cache(cache: Dict[str, Any]) -> None:
-    """Persist scan cache to disk."""
-    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
-    CACHE_PATH.write_text(
-        json.dumps(cache, indent=2, default=str), encoding="utf-8"
-    )
+# In-process view of the table: every row's (scanned_at, vt_verdict), so a
+# freshness check never touches a payload, and the payloads decoded so far. Writes
+# through this connection update both; PRAGMA data_version changing means
+# another connection committed, and both are reloaded.
+_index: Dict[str, tuple[str, Optional[str]]] = {}
+_memo: Dict[str, Dict[str, Any]] = {}
+_memo_version: Optional[int] = None
 
 
-def _is_cache_fresh(entry: Dict[str, Any]) -> bool:
-    """Check if a cache entry is still valid."""
-    scanned_at = entry.get("scanned_at", "")
+def _cache_db() -> sqlite3.Connection:
+    """Open (once) the SQLite scan cache, importing a legacy JSON cache."""
+    global _db, _db_path
+    if _db is not None and _db_path == CACHE_PATH:
+        return _db
+
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(CACHE_PATH, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(_CACHE_SCHEMA)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(scan_cache)")}
+    if "vt_verdict" not in columns:  # caches created before per-verdict TTLs
+        conn.execute("ALTER TABLE scan_cache ADD COLUMN vt_verdict TEXT")
+
+    legacy = CACHE_PATH.with_suffix(".json")
+    if legacy.exists():
+        try:
+            entries = json.loads(legacy.read_text(encoding="utf-8"))
+            _cache_write(conn, entries.items())
+            legacy.unlink()
+        except Exception:
+            pass
+
+    if _db is not None:
+        _db.close()
+    _db, _db_path = conn, CACHE_PATH
+    _sync_memo(conn, force=True)
+    return conn
+
+
+def _sync_memo(conn: sqlite3.Connection, force: bool = False) -> None:
+    """Reload _index (and drop _memo) if another connection wrote."""
+    global _memo_version
+    version = conn.execute("PRAGMA data_version").fetchone()[0]
+    if force or version != _memo_version:
+        _memo.clear()
+        _index.clear()
+        _index.update(
+            (sha, (scanned_at, vt_verdict))
+            for sha, scanned_at, vt_verdict in conn.execute(
+                "SELECT sha256, scanned_at, vt_verdict FROM scan_cache"
+            )
+        )
+        _memo_version = version
+
+
+def _cache_write(conn: sqlite3.Connection, entries) -> None:
+    """INSERT OR REPLACE (sha256, entry) pairs in one transaction."""
+    rows = [
+        (sha, entry.get("scanned_at", ""), entry.get("verdict"),
+         _vt_verdict_of(entry), json.dumps(entry, default=str))
+        for sha, entry in entries
+    ]
+    conn.execute("BEGIN")
+    try:
+        conn.executemany(
+            "INSERT OR REPLACE INTO scan_cache"
+            " (sha256, scanned_at, verdict, vt_verdict, payload)"
+            " VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def _cache_get_fresh(sha256: str) -> Optional[Dict[str, Any]]:
+    """Cached scan result for a file hash if one exists and is fresh."""
+    try:
+        with _db_lock:
+            conn = _cache_db()
+            _sync_memo(conn)
+            scanned_at, vt_verdict = _index.get(sha256, ("", None))
+            if not _is_fresh_at(scanned_at, _cache_ttl(vt_verdict)):
+                return None
+            entry = _memo.get(sha256)
+            if entry is None:
+                row = conn.execute(
+                    "SELECT payload FROM scan_cache WHERE sha256 = ?", (sha256,)
+                ).fetchone()
+                if row is None:
+                    return None
+                entry = _memo[sha256] = json.loads(row[0])
+    except sqlite3.Error:
+        return None
+    return dict(entry)
+
+
+def _cache_put(sha256: str, entry: Dict[str, Any]) -> None:
+    """Store one scan result."""
+    _cache_put_many({sha256: entry})
+
+
+def _cache_put_many(entries: Dict[str, Dict[str, Any]]) -> None:
+    """Store several scan results in a single transaction."""
+    with _db_lock:
+        _cache_write(_cache_db(), entries.items())
+        for sha, entry in entries.items():
+            _index[sha] = (entry.get("scanned_at", ""), _vt_verdict_of(entry))
+            _memo[sha] = dict(entry)
+
+
+def _vt_verdict_of(entry: Dict[str, Any]) -> Optional[str]:
+    """VT verdict stored with an entry: None if VT was not asked, "error" if the lookup failed."""
+    vt = entry.get("virustotal")
+    if not vt:
+        return None
+    return vt.get("verdict") if vt.get("success") else "error"
+
+
+def _cache_ttl(vt_verdict: Optional[str]) -> float:
+    """TTL for an entry with the given _vt_verdict_of() value."""
+    if vt_verdict is None:
+        return CACHE_TTL_STATIC_ONLY
+    return CACHE_TTL_BY_VT_VERDICT.get(vt_verdict, CACHE_TTL_BY_VT_VERDICT["unknown"])
+
+
+def _is_fresh_at(scanned_at: str, ttl: float = CACHE_TTL_SECONDS) -> bool:
+    """Check if a scan made at `scanned_at` (ISO 8601) is within `ttl` seconds."""
     if not scanned_at:
         return False
     try:
         ts = datetime.fromisoformat(scanned_at)
         age = (datetime.now(timezone.utc) - ts).total_seconds()
-        return age < CACHE_TTL_SECONDS
+        return age < ttl
     except Exception:
         return False
 
 
 def clear_cache() -> Dict[str, Any]:
     """Clear the scan cache."""
-    _save_cache({})
+    with _db_lock:
+        _cache_db().execute("DELETE FROM scan_cache")
+        _index.clear()
+        _memo.clear()
     return {"success": True, "message": "Scan cache cleared"}
 
 
 def cache_stats() -> Dict[str, Any]:
     """Return statistics about the scan cache."""
-    cache = _load_cache()
-    total = len(cache)
-    fresh = sum(1 for e in cache.values() if _is_cache_fresh(e))
+    with _db_lock:
+        rows = _cache_db().execute(
+            "SELECT scanned_at, verdict, vt_verdict FROM scan_cache"
+        ).fetchall()
+    total = len(rows)
+    fresh = sum(1 for scanned_at, _v, vt_v in rows if _is_fresh_at(scanned_at, _cache_ttl(vt_v)))
     stale = total - fresh
 
     by_verdict = {}
-    for entry in cache.values():
-        v = entry.get("verdict", "unknown")
+    for _scanned_at, v, _vt_v in rows:
+        v = v or "unknown"
         by_verdict[v] = by_verdict.get(v, 0) + 1
 
     return {
@@ -190,13 +579,41 @@ def cache_stats() -> Dict[str, Any]:
 # File hashing
 # ---------------------------------------------------------------------------
 
+HASH_CHUNK_SIZE = 1 << 20  # 1 MiB: pre-3.11 read buffer and prescan window
+
+
+def _hash_chunked(f, h):
+    """Feed an open binary file into hash object h through one reused buffer."""
+    buf = bytearray(HASH_CHUNK_SIZE)
+    view = memoryview(buf)
+    while True:
+        n = f.readinto(buf)
+        if not n:
+            return h
+        h.update(view[:n])
+
+
 def sha256_file(file_path: Path) -> str:
     """Compute SHA-256 hash of a file."""
-    h = hashlib.sha256()
     with open(file_path, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            h.update(chunk)
-    return h.hexdigest()
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+: hashed in C
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        return _hash_chunked(f, hashlib.sha256()).hexdigest()
+
+
+@contextmanager
+def _map_file(file_path: Path) -> Iterator[bytes]:
+    """
+    Map a file read-only so it can be hashed and regex-scanned without
+    copying it into Python memory. Empty files (which cannot be mapped)
+    yield b"".
+    """
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
 
 
 # ---------------------------------------------------------------------------
@@ -211,27 +628,63 @@ def static_scan(file_path: Path) -> Dict[str, Any]:
         dict with findings list and severity assessment
     """
     try:
-        content = file_path.read_text(encoding="utf-8", errors="replace")
+        with _map_file(file_path) as content:
+            return _static_scan_buffer(content, file_path)
     except Exception as e:
         return {"error": str(e), "findings": []}
 
-    findings: List[Dict[str, str]] = []
 
-    for pattern_re, severity, description in DANGEROUS_PATTERNS:
-        matches = re.findall(pattern_re, content)
-        if matches:
-            # Count occurrences
-            line_numbers = []
-            for i, line in enumerate(content.split("\n"), 1):
-                if re.search(pattern_re, line):
-                    line_numbers.append(i)
+def scan_file_bytes(file_path: Path) -> Dict[str, Any]:
+    """
+    Hash and statically scan a file from a single read-only mapping.
+
+    Returns:
+        dict with "sha256" and "static" (the static_scan() result)
+    """
+    with _map_file(file_path) as content:
+        file_hash, first = _hash_and_prescan(content)
+        return {
+            "sha256": file_hash,
+            "static": _static_scan_buffer(content, file_path, first),
+        }
 
-            findings.append({
-                "pattern": description,
-                "severity": severity,
-                "occurrences": len(matches),
-                "lines": line_numbers[:10],  # cap at 10
-            })
+
+def _static_scan_buffer(
+    content: bytes, file_path: Path, first: Optional[int] = -1
+) -> Dict[str, Any]:
+    """
+    static_scan() over an already-loaded (or mapped) file buffer; `first`
+    is passed on to _match_patterns().
+    """
+    findings: List[Dict[str, Any]] = []
+
+    for bom, encoding in _WIDE_BOMS:
+        if content[:len(bom)] == bom:
+            # Offsets change with the encoding: the prescan's `first` no longer applies
+            content = bytes(content).decode(encoding, errors="replace").encode("utf-8")
+            first = -1
+            break
+
+    matched = _match_patterns(content, first)
+    for idx in sorted(matched):
+        _pattern, severity, description = DANGEROUS_PATTERNS[idx]
+        occurrences, line_numbers = matched[idx]
+        findings.append({
+            "pattern": description,
+            "severity": severity,
+            "occurrences": occurrences,
+            "lines": line_numbers,  # capped at MAX_FINDING_LINES
+        })
+
+    # Every file is pattern-scanned whatever its size (the patterns are
+    # bounded, so this stays linear); binary content is flagged on top
+    if b"\x00" in content[:BINARY_SNIFF_BYTES]:
+        findings.append({
+            "pattern": "Binary content (NUL bytes) in a script file",
+            "severity": "medium",
+            "occurrences": 1,
+            "lines": [],
+        })
 
     # Determine overall severity
     severities = [f["severity"] for f in findings]
@@ -261,6 +714,56 @@ def _vt_api_key() -> Optional[str]:
     return os.environ.get("VIRUSTOTAL_API_KEY")
 
 
+# Send times of the last VT_RATE_LIMIT requests (sliding-window limiter)
+_vt_sent: deque = deque(maxlen=VT_RATE_LIMIT)
+_vt_sent_lock = threading.Lock()
+
+
+def _vt_acquire() -> None:
+    """Block until another VT request fits in the rate window, then claim it."""
+    with _vt_sent_lock:
+        if len(_vt_sent) == _vt_sent.maxlen:
+            wait = VT_RATE_WINDOW - (time.monotonic() - _vt_sent[0])
+            if wait > 0:
+                time.sleep(wait)
+        _vt_sent.append(time.monotonic())
+
+
+# Keep-alive client shared by every VT call, so successive lookups skip the
+# TCP + TLS handshake. Created on first use and closed at exit.
+_vt_client: Optional[KeepAliveClient] = None
+_vt_client_lock = threading.Lock()
+
+
+def _get_vt_client() -> KeepAliveClient:
+    global _vt_client
+    with _vt_client_lock:
+        if _vt_client is None:
+            _vt_client = KeepAliveClient(timeout=15)
+            atexit.register(_vt_client.close)
+        return _vt_client
+
+
+def _vt_request(
+    method: str,
+    path: str,
+    headers: Dict[str, str],
+    body: Any = None,
+    timeout: float = 15,
+) -> tuple[int, str, bytes]:
+    """
+    Send one request to VT_API_BASE + path over the shared keep-alive client.
+
+    Returns (status, reason, body). Raises on network errors; only a reused
+    connection the server had already closed is retried (see
+    KeepAliveClient.request()).
+    """
+    status, _, raw = _get_vt_client().request(
+        method, VT_API_BASE + path, body, headers, timeout=timeout
+    )
+    return status, http.client.responses.get(status, ""), raw
+
+
 def vt_hash_lookup(sha256: str, api_key: Optional[str] = None) -> Dict[str, Any]:
     """
     Look up a file hash on VirusTotal (no upload needed).
@@ -272,60 +775,120 @@ def vt_hash_lookup(sha256: str, api_key: Optional[str] = None) -> Dict[str, Any]
     if not key:
         return {"success": False, "error": "VIRUSTOTAL_API_KEY not set"}
 
-    url = f"{VT_API_BASE}/files/{sha256}"
-    req = urllib.request.Request(
-        url,
-        headers={"x-apikey": key, "Accept": "application/json"},
-        method="GET",
-    )
-
+    _vt_acquire()
     try:
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
-
-        attrs = data.get("data", {}).get("attributes", {})
-        stats = attrs.get("last_analysis_stats", {})
-        malicious = stats.get("malicious", 0)
-        suspicious = stats.get("suspicious", 0)
-        undetected = stats.get("undetected", 0)
-        total = sum(stats.values()) if stats else 0
-
-        if malicious > 0:
-            verdict = "malicious"
-        elif suspicious > 0:
-            verdict = "suspicious"
-        else:
-            verdict = "clean"
+        status, reason, raw = _vt_request(
+            "GET", f"/files/{sha256}",
+            headers={"x-apikey": key, "Accept": "application/json"},
+        )
+    except Exception as e:
+        return {"success": False, "error": f"VT request failed: {e}"}
 
+    return _vt_lookup_result(sha256, status, reason, raw)
+
+
+def vt_hash_lookup_bulk(
+    hashes: List[str], api_key: Optional[str] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Look up many file hashes on VirusTotal in one pass.
+
+    The public v3 API has no multi-hash lookup, so this still sends one
+    GET per unique hash (each charged against the rate limit), all over
+    the shared keep-alive client.
+
+    Returns:
+        {sha256: vt_hash_lookup() result}
+    """
+    return {sha256: vt_hash_lookup(sha256, api_key) for sha256 in dict.fromkeys(hashes)}
+
+
+def _vt_lookup_result(sha256: str, status: int, reason: str, raw: bytes) -> Dict[str, Any]:
+    """Turn a GET /files/{sha256} response into a lookup result dict."""
+    if status == 404:
         return {
             "success": True,
-            "verdict": verdict,
-            "malicious": malicious,
-            "suspicious": suspicious,
-            "undetected": undetected,
-            "total_engines": total,
+            "verdict": "unknown",
+            "message": "File not found in VirusTotal database",
             "sha256": sha256,
             "source": "virustotal_hash",
         }
+    if status == 429:
+        return {
+            "success": False,
+            "error": "VirusTotal rate limit exceeded (4 req/min on free tier)",
+        }
+    if not 200 <= status < 300:
+        return {"success": False, "error": f"VT API error {status}: {reason}"}
 
-    except urllib.error.HTTPError as e:
-        if e.code == 404:
-            return {
-                "success": True,
-                "verdict": "unknown",
-                "message": "File not found in VirusTotal database",
-                "sha256": sha256,
-                "source": "virustotal_hash",
-            }
-        if e.code == 429:
-            return {
-                "success": False,
-                "error": "VirusTotal rate limit exceeded (4 req/min on free tier)",
-            }
-        return {"success": False, "error": f"VT API error {e.code}: {e.reason}"}
+    try:
+        data = json.loads(raw.decode("utf-8"))
     except Exception as e:
         return {"success": False, "error": f"VT request failed: {e}"}
 
+    attrs = data.get("data", {}).get("attributes", {})
+    stats = attrs.get("last_analysis_stats", {})
+    malicious = stats.get("malicious", 0)
+    suspicious = stats.get("suspicious", 0)
+    undetected = stats.get("undetected", 0)
+    total = sum(stats.values()) if stats else 0
+
+    if malicious > 0:
+        verdict = "malicious"
+    elif suspicious > 0:
+        verdict = "suspicious"
+    else:
+        verdict = "clean"
+
+    return {
+        "success": True,
+        "verdict": verdict,
+        "malicious": malicious,
+        "suspicious": suspicious,
+        "undetected": undetected,
+        "total_engines": total,
+        "sha256": sha256,
+        "source": "virustotal_hash",
+    }
+
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class _MultipartFile:
+    """
+    Multipart/form-data body for one file, streamed in UPLOAD_CHUNK_SIZE
+    chunks. Iterable more than once (the file is reopened), so a request
+    retried on a fresh connection resends the whole body.
+    """
+
+    def __init__(self, file_path: Path, size: int, boundary: str) -> None:
+        self.file_path = file_path
+        self.size = size
+        self.head = (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="file"; filename="{file_path.name}"\r\n'
+            f"Content-Type: application/octet-stream\r\n\r\n"
+        ).encode("utf-8")
+        self.tail = f"\r\n--{boundary}--\r\n".encode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self.head) + self.size + len(self.tail)
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield self.head
+        remaining = self.size  # never send more than Content-Length promised
+        with open(self.file_path, "rb") as f:
+            while remaining > 0:
+                chunk = f.read(min(UPLOAD_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+        if remaining:
+            raise OSError(f"{self.file_path} shrank during upload")
+        yield self.tail
+
 
 def vt_upload_file(file_path: Path, api_key: Optional[str] = None) -> Dict[str, Any]:
     """
@@ -338,39 +901,39 @@ def vt_upload_file(file_path: Path, api_key: Optional[str] = None) -> Dict[str,
     if not key:
         return {"success": False, "error": "VIRUSTOTAL_API_KEY not set"}
 
-    if file_path.stat().st_size > MAX_UPLOAD_BYTES:
+    size = file_path.stat().st_size
+    if size > MAX_UPLOAD_BYTES:
         return {
             "success": False,
-            "error": f"File too large ({file_path.stat().st_size} bytes, max {MAX_UPLOAD_BYTES})",
+            "error": f"File too large ({size} bytes, max {MAX_UPLOAD_BYTES})",
         }
 
-    # Multipart form upload
+    # Multipart form upload, streamed from disk
     boundary = "----BrivenSkillScan"
-    file_content = file_path.read_bytes()
-    filename = file_path.name
-
-    body = (
-        f"--{boundary}\r\n"
-        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
-        f"Content-Type: application/octet-stream\r\n\r\n"
-    ).encode("utf-8") + file_content + f"\r\n--{boundary}--\r\n".encode("utf-8")
-
-    url = f"{VT_API_BASE}/files"
-    req = urllib.request.Request(
-        url,
-        data=body,
-        headers={
-            "x-apikey": key,
-            "Content-Type": f"multipart/form-data; boundary={boundary}",
-            "Accept": "application/json",
-        },
-        method="POST",
-    )
+    body = _MultipartFile(file_path, size, boundary)
 
+    _vt_acquire()
     try:
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
+        status, reason, raw = _vt_request(
+            "POST", "/files",
+            headers={
+                "x-apikey": key,
+                "Content-Type": f"multipart/form-data; boundary={boundary}",
+                "Content-Length": str(len(body)),
+                "Accept": "application/json",
+            },
+            body=body,
+            timeout=30,
+        )
+        if status == 429:
+            return {
+                "success": False,
+                "error": "VirusTotal rate limit exceeded",
+            }
+        if not 200 <= status < 300:
+            return {"success": False, "error": f"VT upload error {status}: {reason}"}
 
+        data = json.loads(raw.decode("utf-8"))
         analysis_id = data.get("data", {}).get("id", "")
         return {
             "success": True,
@@ -378,13 +941,6 @@ def vt_upload_file(file_path: Path, api_key: Optional[str] = None) -> Dict[str,
             "message": f"File uploaded for scanning: {analysis_id}",
             "source": "virustotal_upload",
         }
-    except urllib.error.HTTPError as e:
-        if e.code == 429:
-            return {
-                "success": False,
-                "error": "VirusTotal rate limit exceeded",
-            }
-        return {"success": False, "error": f"VT upload error {e.code}: {e.reason}"}
     except Exception as e:
         return {"success": False, "error": f"VT upload failed: {e}"}
 
@@ -398,6 +954,7 @@ def scan_file(
     use_vt: bool = True,
     upload: bool = False,
     api_key: Optional[str] = None,
+    persist: bool = True,
 ) -> Dict[str, Any]:
     """
     Scan a single file through both static analysis and VirusTotal.
@@ -407,38 +964,99 @@ def scan_file(
         use_vt: Whether to check VirusTotal (requires API key)
         upload: Whether to upload unknown files to VT
         api_key: Optional VT API key override
+        persist: Whether to store the result in the scan cache
 
     Returns:
         dict with combined verdict
     """
+    result = _scan_local(file_path)
+    if not result.get("success") or result.get("from_cache"):
+        return result
+
+    _scan_remote(result, file_path, use_vt, upload, api_key)
+
+    # Update cache
+    if persist:
+        _cache_put(result["sha256"], result)
+
+    return result
+
+
+def _scan_local(
+    file_path: Path, claim: Optional[Callable[[str], bool]] = None
+) -> Dict[str, Any]:
+    """
+    Hash + static layer of scan_file(). Returns the fresh cache entry for
+    the file if there is one, otherwise a result without a verdict yet.
+    Only reads the cache, so it is safe to run from several threads.
+
+    If claim(sha256) returns False, another file with the same content is
+    already being scanned: only {"sha256", "duplicate": True} is returned.
+    """
     if not file_path.exists():
         return {"success": False, "error": f"File not found: {file_path}"}
 
-    file_hash = sha256_file(file_path)
+    # One pass over the mapping hashes it and finds the first anchor
+    # literal; on a cache miss the static scan resumes from there
+    with _map_file(file_path) as content:
+        file_hash, first = _hash_and_prescan(content)
 
-    # Check cache first
-    cache = _load_cache()
-    cached = cache.get(file_hash)
-    if cached and _is_cache_fresh(cached) and cached.get("file") == str(file_path):
-        cached["from_cache"] = True
-        return cached
+        if claim is not None and not claim(file_hash):
+            return {"success": True, "sha256": file_hash, "duplicate": True}
 
-    result: Dict[str, Any] = {
+        # Check cache first (by content, whatever path it was scanned under)
+        cached = _cache_get_fresh(file_hash)
+        if cached:
+            cached["from_cache"] = True
+            return _for_file(cached, file_path)
+
+        # Layer 1: Static analysis
+        static = _static_scan_buffer(content, file_path, first)
+
+    return {
         "success": True,
         "file": str(file_path),
         "sha256": file_hash,
         "scanned_at": datetime.now(timezone.utc).isoformat(),
         "from_cache": False,
+        "static": static,
     }
 
-    # Layer 1: Static analysis
-    static = static_scan(file_path)
-    result["static"] = static
+
+def _for_file(result: Dict[str, Any], file_path: Path) -> Dict[str, Any]:
+    """Copy of a scan result for another file with the same content."""
+    result = dict(result, file=str(file_path))
+    if "static" in result:
+        result["static"] = dict(result["static"], file=str(file_path))
+    return result
+
+
+def _scan_remote(
+    result: Dict[str, Any],
+    file_path: Path,
+    use_vt: bool,
+    upload: bool,
+    api_key: Optional[str],
+    vt_lookups: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> None:
+    """
+    VirusTotal layer of scan_file(); sets the combined verdict on result.
+
+    vt_lookups memoizes hash lookups across calls, so files with the same
+    content cost one VT request.
+    """
+    file_hash = result["sha256"]
+    static = result["static"]
 
     # Layer 2: VirusTotal (if enabled and key available)
     vt_result = None
     if use_vt and (_vt_api_key() or api_key):
-        vt_result = vt_hash_lookup(file_hash, api_key)
+        if vt_lookups is not None and file_hash in vt_lookups:
+            vt_result = vt_lookups[file_hash]
+        else:
+            vt_result = vt_hash_lookup(file_hash, api_key)
+            if vt_lookups is not None:
+                vt_lookups[file_hash] = vt_result
         result["virustotal"] = vt_result
 
         # Upload if requested and file is unknown
@@ -464,12 +1082,6 @@ def scan_file(
     else:
         result["verdict"] = "clean"
 
-    # Update cache
-    cache[file_hash] = result
-    _save_cache(cache)
-
-    return result
-
 
 def _build_reason(static_severity: str, vt_verdict: str) -> str:
     """Build a human-readable reason string."""
@@ -481,6 +1093,36 @@ def _build_reason(static_severity: str, vt_verdict: str) -> str:
     return "; ".join(parts) if parts else "clean"
 
 
+_SCANNABLE_SUFFIXES = tuple(SCANNABLE_EXTENSIONS)
+
+
+def _iter_scannable(root: Path) -> Iterator[Path]:
+    """
+    Scannable files under root, each directory's files (by name) before
+    its subdirectories. Like os.walk, symlinked directories are not
+    followed but symlinked files are yielded.
+    """
+    stack = [os.fspath(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+        subdirs = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+            if is_dir:
+                if entry.name not in SKIP_DIRS and not entry.is_symlink():
+                    subdirs.append(entry.path)
+            elif entry.name.lower().endswith(_SCANNABLE_SUFFIXES):
+                yield Path(entry.path)
+        stack.extend(reversed(subdirs))
+
+
 def scan_skill(
     skill_path: Path,
     use_vt: bool = True,
@@ -512,30 +1154,58 @@ def scan_skill(
     if not skill_path.is_dir():
         return {"success": False, "error": f"Path not found: {skill_path}"}
 
-    results = []
-    blocked = False
-    warnings = False
-    vt_delay_needed = False
-
-    for root, _dirs, files in os.walk(skill_path):
-        for filename in sorted(files):
-            fp = Path(root) / filename
-            if fp.suffix.lower() not in SCANNABLE_EXTENSIONS:
-                continue
-
-            # Rate limit VT calls (free tier: 4/min)
-            if use_vt and vt_delay_needed:
-                time.sleep(16)  # ~4 requests per minute
-            vt_delay_needed = use_vt and bool(_vt_api_key() or api_key)
-
-            file_result = scan_file(fp, use_vt, upload, api_key)
-            results.append(file_result)
-
-            verdict = file_result.get("verdict", "unknown")
-            if verdict == "blocked":
-                blocked = True
-            elif verdict == "warning":
-                warnings = True
+    paths = list(_iter_scannable(skill_path))
+
+    # Files with identical content are scanned once: the first worker to
+    # hash a given sha256 claims it, the others stop after hashing.
+    claimed: set = set()
+    claim_lock = threading.Lock()
+
+    def claim(file_hash: str) -> bool:
+        with claim_lock:
+            if file_hash in claimed:
+                return False
+            claimed.add(file_hash)
+            return True
+
+    # Hash + static layers in parallel: hashing releases the GIL and the
+    # cache is only read here.
+    if len(paths) > 1:
+        with ThreadPoolExecutor(max_workers=min(SCAN_WORKERS, len(paths))) as pool:
+            results = list(pool.map(lambda fp: _scan_local(fp, claim), paths))
+    else:
+        results = [_scan_local(fp, claim) for fp in paths]
+
+    # VirusTotal layer, only for files the cache did not answer: all
+    # missing hashes go out in one bulk lookup, then results are merged.
+    pending = [
+        (fp, r) for fp, r in zip(paths, results)
+        if r.get("success") and not r.get("from_cache") and not r.get("duplicate")
+    ]
+    vt_lookups: Dict[str, Dict[str, Any]] = {}
+    if use_vt and (_vt_api_key() or api_key) and pending:
+        vt_lookups = vt_hash_lookup_bulk([r["sha256"] for _fp, r in pending], api_key)
+
+    for fp, file_result in pending:
+        _scan_remote(file_result, fp, use_vt, upload, api_key, vt_lookups)
+
+    # One cache transaction per run, not one per file
+    if pending:
+        _cache_put_many({r["sha256"]: r for _fp, r in pending})
+
+    # Fan each scanned result out to the duplicates of its content
+    by_hash = {
+        r["sha256"]: r for r in results
+        if r.get("success") and not r.get("duplicate")
+    }
+    results = [
+        _for_file(by_hash[r["sha256"]], fp) if r.get("duplicate") else r
+        for fp, r in zip(paths, results)
+    ]
+
+    verdicts = {r.get("verdict", "unknown") for r in results}
+    blocked = "blocked" in verdicts
+    warnings = "warning" in verdicts
 
     if not results:
         return {
@@ -16,10 +16,110 @@ Docs:
 """
 
 import argparse
+import functools
 import json
 import os
 import sys
-import urllib.request
+import threading
+
+try:
+    from tools.http_keepalive import KeepAliveClient
+except ImportError:  # run as a script from inside tools/
+    from http_keepalive import KeepAliveClient
+
+BOT_API_URL = "https://slack.com/api/chat.postMessage"
+
+# Payloads are built from byte templates around a C-escaped JSON string
+# (the same escaper json.dumps uses), so the output is byte-identical to
+# json.dumps({...}) without building a dict and walking it per message.
+_json_str = json.encoder.encode_basestring_ascii
+_WEBHOOK_PREFIX = b'{"text": '
+_PAYLOAD_SUFFIX = b"}"
+
+
+def _text_payload(prefix: bytes, message: str) -> bytes:
+    """JSON body: prefix, then the escaped message as the last ("text") field."""
+    return prefix + _json_str(message).encode("ascii") + _PAYLOAD_SUFFIX
+
+
+@functools.lru_cache(maxsize=32)
+def _bot_prefix(channel: str) -> bytes:
+    """'{"channel": <channel>, "text": ' for chat.postMessage, per channel."""
+    return b'{"channel": ' + _json_str(channel).encode("ascii") + b', "text": '
+
+
+class SlackClient:
+    """
+    Sends Slack messages over pooled keep-alive HTTPS connections
+    (KeepAliveClient), so repeated notifications skip the TCP + TLS
+    handshake. Thread-safe.
+    """
+
+    def __init__(self, timeout: float = 10) -> None:
+        self.timeout = timeout
+        self._http = KeepAliveClient(timeout=timeout)
+
+    def close(self) -> None:
+        """Close every open connection."""
+        self._http.close()
+
+    def _post(self, url: str, data: bytes, headers: dict) -> tuple[int, str]:
+        """POST data to url; returns (status, body). Raises on HTTP >= 400."""
+        try:
+            status, raw = self._http.post(url, data, headers)
+        except ValueError:
+            raise ValueError(f"Invalid Slack URL: {url}") from None
+        body = raw.decode("utf-8", errors="replace")
+        if status >= 400:
+            raise RuntimeError(f"Slack API error {status}: {body.strip()}")
+        return status, body
+
+    def send_webhook(self, message: str, webhook_url: str | None = None) -> dict:
+        """Send a message via Slack Incoming Webhook (simplest setup)."""
+        url = webhook_url or os.environ.get("SLACK_WEBHOOK_URL")
+        if not url:
+            raise ValueError("SLACK_WEBHOOK_URL not set in environment or .env")
+
+        payload = _text_payload(_WEBHOOK_PREFIX, message)
+        _status, body = self._post(url, payload, {"Content-Type": "application/json"})
+        # Webhook returns "ok" as plain text on success
+        return {"ok": body.strip() == "ok", "response": body.strip()}
+
+    def send_bot_message(
+        self,
+        message: str,
+        channel: str | None = None,
+        bot_token: str | None = None,
+    ) -> dict:
+        """Send a message via Slack Bot API (chat.postMessage)."""
+        token = bot_token or os.environ.get("SLACK_BOT_TOKEN")
+        ch = channel or os.environ.get("SLACK_CHANNEL")
+
+        if not token:
+            raise ValueError("SLACK_BOT_TOKEN not set in environment or .env")
+        if not ch:
+            raise ValueError("SLACK_CHANNEL not set (--channel or SLACK_CHANNEL env var)")
+
+        payload = _text_payload(_bot_prefix(ch), message)
+
+        _status, body = self._post(BOT_API_URL, payload, {
+            "Content-Type": "application/json; charset=utf-8",
+            "Authorization": f"Bearer {token}",
+        })
+        return json.loads(body)
+
+
+_DEFAULT_CLIENT: SlackClient | None = None
+_DEFAULT_CLIENT_LOCK = threading.Lock()
+
+
+def _default_client() -> SlackClient:
+    """Shared client behind the module-level functions, created on first use."""
+    global _DEFAULT_CLIENT
+    with _DEFAULT_CLIENT_LOCK:
+        if _DEFAULT_CLIENT is None:
+            _DEFAULT_CLIENT = SlackClient()
+        return _DEFAULT_CLIENT
 
 
 def send_webhook(
@@ -27,21 +127,7 @@ def send_webhook(
     webhook_url: str | None = None,
 ) -> dict:
     """Send a message via Slack Incoming Webhook (simplest setup)."""
-    url = webhook_url or os.environ.get("SLACK_WEBHOOK_URL")
-    if not url:
-        raise ValueError("SLACK_WEBHOOK_URL not set in environment or .env")
-
-    payload = json.dumps({"text": message}).encode("utf-8")
-    req = urllib.request.Request(
-        url,
-        data=payload,
-        headers={"Content-Type": "application/json"},
-        method="POST",
-    )
-    with urllib.request.urlopen(req, timeout=10) as resp:
-        body = resp.read().decode("utf-8")
-        # Webhook returns "ok" as plain text on success
-        return {"ok": body.strip() == "ok", "response": body.strip()}
+    return _default_client().send_webhook(message, webhook_url=webhook_url)
 
 
 def send_bot_message(
@@ -50,31 +136,7 @@ def send_bot_message(
     bot_token: str | None = None,
 ) -> dict:
     """Send a message via Slack Bot API (chat.postMessage)."""
-    token = bot_token or os.environ.get("SLACK_BOT_TOKEN")
-    ch = channel or os.environ.get("SLACK_CHANNEL")
-
-    if not token:
-        raise ValueError("SLACK_BOT_TOKEN not set in environment or .env")
-    if not ch:
-        raise ValueError("SLACK_CHANNEL not set (--channel or SLACK_CHANNEL env var)")
-
-    url = "https://slack.com/api/chat.postMessage"
-    payload = json.dumps({
-        "channel": ch,
-        "text": message,
-    }).encode("utf-8")
-
-    req = urllib.request.Request(
-        url,
-        data=payload,
-        headers={
-            "Content-Type": "application/json; charset=utf-8",
-            "Authorization": f"Bearer {token}",
-        },
-        method="POST",
-    )
-    with urllib.request.urlopen(req, timeout=10) as resp:
-        return json.loads(resp.read().decode("utf-8"))
+    return _default_client().send_bot_message(message, channel=channel, bot_token=bot_token)
 
 
 def send_message(
@@ -12,18 +12,31 @@ Usage:
     python tools/tailscale.py --peers
     python tools/tailscale.py --serve --port 8000
     python tools/tailscale.py --apply-acl
+    python tools/tailscale.py --apply-acl --watch
     python tools/tailscale.py --acl-status
 """
 
 import argparse
+import contextlib
+import functools
+import http.client
+import io
 import json
 import logging
+import mmap
 import os
+import socket
 import subprocess
 import sys
+import tempfile
+import time
+import urllib.error
 from typing import Optional
 
-import requests
+try:
+    from tools.http_keepalive import KeepAliveClient
+except ImportError:  # run as a script from inside tools/
+    from http_keepalive import KeepAliveClient
 
 logger = logging.getLogger("briven.tailscale")
 
@@ -57,76 +70,192 @@ BRIVEN_ACL_POLICY = {
 }
 
 
-def _get_api_key() -> str:
-    """Load TAILSCALE_API_KEY from environment or usr/.env."""
-    key = os.environ.get("TAILSCALE_API_KEY", "")
-    if key:
-        return key
+# .env files checked for settings, in priority order
+_ENV_FILES = ("usr/.env", ".env")
 
-    # Try loading from usr/.env
-    for env_path in ["usr/.env", ".env"]:
-        try:
-            with open(env_path) as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith("TAILSCALE_API_KEY="):
-                        val = line.split("=", 1)[1].strip().strip("\"'")
-                        if val:
-                            return val
-        except FileNotFoundError:
-            continue
 
+@functools.lru_cache(maxsize=None)
+def _load_dotenv(path: str) -> dict[str, str]:
+    """Parse a .env file once into a mapping (comments skipped, quotes stripped)."""
+    env: dict[str, str] = {}
+    try:
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#") or "=" not in line:
+                    continue
+                name, val = line.split("=", 1)
+                env[name.strip()] = val.strip().strip("\"'")
+    except FileNotFoundError:
+        pass
+    return env
+
+
+@functools.lru_cache(maxsize=None)
+def _dotenv_value(path: str, name: str) -> str:
+    """
+    Return the first non-empty `name=value` in a .env file, located with
+    mmap + bytes.find rather than a Python loop over lines.
+    """
+    try:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            prefix = name.encode() + b"="
+            idx = mm.find(prefix)
+            while idx >= 0:
+                line_start = mm.rfind(b"\n", 0, idx) + 1
+                line_end = mm.find(b"\n", idx)
+                if line_end < 0:
+                    line_end = len(mm)
+                # Only a key at the start of a line counts (not FOO_NAME= or a comment)
+                if not mm[line_start:idx].strip():
+                    val = mm[idx + len(prefix):line_end].strip().strip(b"\"'")
+                    if val:
+                        return val.decode("utf-8", errors="replace")
+                idx = mm.find(prefix, line_end)
+        return ""
+    except FileNotFoundError:
+        return ""
+    except (OSError, ValueError):
+        # Empty file or a filesystem without mmap support
+        return _load_dotenv(path).get(name, "")
+
+
+def _env_setting(name: str) -> str:
+    """Return a setting from the environment, else the first .env file that sets it."""
+    val = os.environ.get(name, "")
+    if val:
+        return val
+    for env_path in _ENV_FILES:
+        val = _dotenv_value(env_path, name)
+        if val:
+            return val
     return ""
 
 
+@functools.lru_cache(maxsize=1)
+def _get_api_key() -> str:
+    """Load TAILSCALE_API_KEY from environment or usr/.env."""
+    return _env_setting("TAILSCALE_API_KEY")
+
+
 def _get_tailnet() -> str:
     """Determine the tailnet name. Uses TAILSCALE_TAILNET env or defaults to '-' (auto)."""
-    return os.environ.get("TAILSCALE_TAILNET", "-")
+    return _env_setting("TAILSCALE_TAILNET") or "-"
+
+
+def _invalidate_env_cache() -> None:
+    """Forget cached .env contents and API key (e.g. after editing usr/.env)."""
+    _load_dotenv.cache_clear()
+    _dotenv_value.cache_clear()
+    _get_api_key.cache_clear()
+
+
+# ── Keep-alive API client ────────────────────────────────────
+# One keep-alive client for all API calls, so repeated ACL reads/writes
+# reuse the TLS connection. Transient failures (429/5xx) are retried with
+# backoff; POST is included because the ACL endpoint replaces the whole policy.
+_CLIENT: Optional[KeepAliveClient] = None
 
+# Retries per API call on 429/5xx
+API_RETRIES = 3
 
-def _api_headers(api_key: str) -> dict:
-    """Build authorization headers for the Tailscale API."""
-    return {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json",
-    }
+# Largest API response body we will buffer (ACLs are normally a few hundred KB)
+API_MAX_BYTES = 2 * 1024 * 1024
+
+
+def _api_request(
+    method: str, url: str, api_key: str,
+    payload: Optional[dict] = None, extra_headers: Optional[dict] = None,
+) -> tuple[dict, http.client.HTTPMessage]:
+    """
+    Call the Tailscale API; returns (decoded JSON, response headers).
+    Raises urllib.error.HTTPError on a non-2xx status.
+    """
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = KeepAliveClient(timeout=30, max_idle=4)
+    headers = {"Authorization": f"Bearer {api_key}"}
+    if extra_headers:
+        headers.update(extra_headers)
+    data = None
+    if payload is not None:
+        headers["Content-Type"] = "application/json"
+        data = json.dumps(payload).encode("utf-8")
+    status, resp_headers, body = _CLIENT.request(
+        method, url, data, headers, API_RETRIES, max_bytes=API_MAX_BYTES
+    )
+    logger.debug("%s %s -> %d (%d bytes)", method, url, status, len(body))
+    if not 200 <= status < 300:
+        raise urllib.error.HTTPError(
+            url, status, http.client.responses.get(status, ""), resp_headers, io.BytesIO(body)
+        )
+    return json.loads(body), resp_headers
 
 
 # ── ACL functions ─────────────────────────────────────────────
 
+def get_acl_with_etag(api_key: str, tailnet: str) -> tuple[dict, Optional[str]]:
+    """Fetch the current ACL policy and its ETag (None if the API sent none)."""
+    url = f"{TAILSCALE_API_BASE}/tailnet/{tailnet}/acl"
+    acl, headers = _api_request("GET", url, api_key)
+    return acl, headers.get("ETag")
+
+
 def get_acl(api_key: str, tailnet: str) -> dict:
     """Fetch the current ACL policy from the Tailscale API."""
-    url = f"{TAILSCALE_API_BASE}/tailnet/{tailnet}/acl"
-    resp = requests.get(url, headers=_api_headers(api_key), timeout=30)
-    resp.raise_for_status()
-    return resp.json()
+    return get_acl_with_etag(api_key, tailnet)[0]
 
 
-def patch_acl(api_key: str, tailnet: str, new_acl: dict) -> dict:
+def patch_acl(api_key: str, tailnet: str, new_acl: dict, if_match: Optional[str] = None) -> dict:
     """
     Replace the tailnet ACL policy via POST (full replace).
+    With if_match, the API rejects the write (412) if the policy's ETag changed.
     Returns the updated ACL from the API.
     """
     url = f"{TAILSCALE_API_BASE}/tailnet/{tailnet}/acl"
-    resp = requests.post(
-        url,
-        headers=_api_headers(api_key),
-        json=new_acl,
-        timeout=30,
-    )
-    resp.raise_for_status()
-    return resp.json()
+    extra = {"If-Match": if_match} if if_match else None
+    return _api_request("POST", url, api_key, new_acl, extra)[0]
+
+
+# The canonical Briven rule, checked by exact match in _acl_already_applied
+_BRIVEN_SRC = BRIVEN_ACL_POLICY["acls"][0]["src"][0]
+_BRIVEN_DST = frozenset(BRIVEN_ACL_POLICY["acls"][0]["dst"])
+
+# Policy sections apply_briven_acl merges into
+_BRIVEN_POLICY_KEYS = tuple(BRIVEN_ACL_POLICY)
 
 
 def _acl_already_applied(current_acl: dict) -> bool:
     """Check if the Briven ACL rules are already present in the current policy."""
-    current_acls = current_acl.get("acls", [])
-    for rule in current_acls:
-        src = rule.get("src", [])
-        dst = rule.get("dst", [])
-        if "tag:admin" in src and any("tag:briven-server" in d for d in dst):
-            return True
-    return False
+    return any(
+        _BRIVEN_SRC in rule.get("src", ()) and _BRIVEN_DST.issubset(rule.get("dst", ()))
+        for rule in current_acl.get("acls", ())
+    )
+
+
+def _merge_briven_acl(current_acl: dict) -> dict:
+    """Merge the Briven rules into an existing policy, preserving its entries."""
+    merged = dict(current_acl)
+
+    # Add Briven ACL rules
+    existing_acls = merged.get("acls", [])
+    existing_acls.extend(BRIVEN_ACL_POLICY["acls"])
+    merged["acls"] = existing_acls
+
+    # Merge tagOwners
+    existing_tags = merged.get("tagOwners", {})
+    for tag, owners in BRIVEN_ACL_POLICY["tagOwners"].items():
+        if tag not in existing_tags:
+            existing_tags[tag] = owners
+    merged["tagOwners"] = existing_tags
+
+    # Merge SSH rules
+    existing_ssh = merged.get("ssh", [])
+    for ssh_rule in BRIVEN_ACL_POLICY.get("ssh", []):
+        existing_ssh.append(ssh_rule)
+    merged["ssh"] = existing_ssh
+
+    return merged
 
 
 def apply_briven_acl() -> str:
@@ -159,41 +288,37 @@ def apply_briven_acl() -> str:
 
     tailnet = _get_tailnet()
 
-    # Fetch current ACL
-    try:
-        current_acl = get_acl(api_key, tailnet)
-    except requests.HTTPError as e:
-        if e.response is not None and e.response.status_code == 401:
-            raise ValueError("TAILSCALE_API_KEY is invalid or expired.") from e
-        raise
-
-    # Idempotent: skip if already applied
-    if _acl_already_applied(current_acl):
-        return "Briven ACL already applied — no changes needed."
-
-    # Merge: preserve existing ACLs, add Briven rules
-    merged = dict(current_acl)
-
-    # Add Briven ACL rules
-    existing_acls = merged.get("acls", [])
-    existing_acls.extend(BRIVEN_ACL_POLICY["acls"])
-    merged["acls"] = existing_acls
-
-    # Merge tagOwners
-    existing_tags = merged.get("tagOwners", {})
-    for tag, owners in BRIVEN_ACL_POLICY["tagOwners"].items():
-        if tag not in existing_tags:
-            existing_tags[tag] = owners
-    merged["tagOwners"] = existing_tags
+    # Fetch, merge and write conditionally on the fetched ETag, so a policy
+    # edited in between is never overwritten; on a conflict, start over once
+    for attempt in range(2):
+        try:
+            current_acl, etag = get_acl_with_etag(api_key, tailnet)
+        except urllib.error.HTTPError as e:
+            if e.code == 401:
+                raise ValueError("TAILSCALE_API_KEY is invalid or expired.") from e
+            raise
+
+        # Idempotent: skip if already applied
+        if _acl_already_applied(current_acl):
+            return "Briven ACL already applied — no changes needed."
+
+        if not any(current_acl.get(k) for k in _BRIVEN_POLICY_KEYS):
+            # Fresh policy: nothing to merge, send the Briven sections as-is
+            # (other top-level keys such as groups/hosts are kept)
+            merged = {**current_acl, **BRIVEN_ACL_POLICY}
+        else:
+            merged = _merge_briven_acl(current_acl)
 
-    # Merge SSH rules
-    existing_ssh = merged.get("ssh", [])
-    for ssh_rule in BRIVEN_ACL_POLICY.get("ssh", []):
-        existing_ssh.append(ssh_rule)
-    merged["ssh"] = existing_ssh
+        # Apply
+        try:
+            patch_acl(api_key, tailnet, merged, if_match=etag)
+        except urllib.error.HTTPError as e:
+            if e.code == 412 and attempt == 0:
+                logger.info("ACL changed since it was fetched; retrying merge")
+                continue
+            raise
+        break
 
-    # Apply
-    patch_acl(api_key, tailnet, merged)
     return "Briven ACL applied: tag:admin → tag:briven-server:8000 (deny all others)."
 
 
@@ -206,7 +331,7 @@ def acl_status() -> str:
     tailnet = _get_tailnet()
     try:
         current_acl = get_acl(api_key, tailnet)
-    except requests.HTTPError as e:
+    except (urllib.error.HTTPError, RuntimeError) as e:
         return f"Failed to fetch ACL: {e}"
 
     if _acl_already_applied(current_acl):
@@ -216,54 +341,216 @@ def acl_status() -> str:
 
 # ── CLI helpers (existing) ────────────────────────────────────
 
-def run(cmd: list[str], capture: bool = True) -> subprocess.CompletedProcess:
-    """Run a shell command and return the result."""
+def run(cmd: list[str], capture: bool = True, text: bool = False) -> subprocess.CompletedProcess:
+    """
+    Run a command (no shell) and return the result. Output is bytes unless
+    text=True; captured runs get stdin from /dev/null instead of the TTY.
+    """
     return subprocess.run(
         cmd,
         capture_output=capture,
-        text=True,
+        stdin=subprocess.DEVNULL if capture else None,
+        text=text,
         check=False,
     )
 
 
 def get_status() -> dict:
     """Return parsed `tailscale status --json` output."""
-    result = run(["tailscale", "status", "--json"])
-    if result.returncode != 0:
-        raise RuntimeError(f"tailscale status failed: {result.stderr.strip()}")
-    return json.loads(result.stdout)
+    # Parse straight from the pipe instead of buffering the whole (possibly
+    # multi-MB) output first; stderr goes to a temp file so a chatty daemon
+    # can't fill its pipe and stall us while we read stdout.
+    with tempfile.TemporaryFile() as err:
+        with subprocess.Popen(
+            ["tailscale", "status", "--json"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=err,
+        ) as proc:
+            try:
+                status = json.load(proc.stdout)
+            except ValueError:
+                if proc.wait() == 0:
+                    raise
+                status = None
+        if proc.returncode != 0:
+            err.seek(0)
+            message = err.read().decode("utf-8", errors="replace").strip()
+            raise RuntimeError(f"tailscale status failed: {message}")
+    return status
+
+
+def get_ip(family: str = "4", status: Optional[dict] = None) -> Optional[str]:
+    """
+    Return this machine's Tailscale IP address (IPv4 by default).
+    Pass a pre-fetched get_status() result to avoid another subprocess call.
+    """
+    if status is None:
+        try:
+            status = get_status()
+        except (RuntimeError, ValueError):
+            return None
+    ips = (status.get("Self") or {}).get("TailscaleIPs") or []
+    want_v6 = family != "4"
+    return next((ip for ip in ips if (":" in ip) == want_v6), None)
 
 
-def get_ip(family: str = "4") -> Optional[str]:
-    """Return this machine's Tailscale IP address (IPv4 by default)."""
-    flag = "-4" if family == "4" else "-6"
-    result = run(["tailscale", "ip", flag])
-    if result.returncode != 0:
-        return None
-    return result.stdout.strip()
+_NO_IPS = ("?",)
 
 
-def get_peers() -> list[dict]:
+def get_peers(status: Optional[dict] = None) -> list[dict]:
     """Return a list of connected Tailscale peers."""
-    status = get_status()
-    peers = status.get("Peer", {})
+    if status is None:
+        status = get_status()
+    # "Peer" is null on a tailnet with no other nodes, TailscaleIPs can be empty
     return [
         {
             "hostname": info.get("HostName", "unknown"),
-            "ip": info.get("TailscaleIPs", ["?"])[0],
+            "ip": (info.get("TailscaleIPs") or _NO_IPS)[0],
             "online": info.get("Online", False),
             "os": info.get("OS", "unknown"),
         }
-        for info in peers.values()
+        for info in (status.get("Peer") or {}).values()
     ]
 
 
+# tailscaled LocalAPI socket locations, by sys.platform (Windows uses a named pipe)
+_TAILSCALED_SOCKETS = {
+    "linux": ("/var/run/tailscale/tailscaled.sock", "/run/tailscale/tailscaled.sock"),
+    "darwin": ("/var/run/tailscaled.socket",),
+    "freebsd": ("/var/run/tailscale/tailscaled.sock",),
+}
+
+
+def _probe_daemon_socket() -> Optional[bool]:
+    """
+    Connect to tailscaled's socket: True if it accepts, False if only a stale
+    socket file is left, None if no socket was found (unknown).
+    """
+    for path in _TAILSCALED_SOCKETS.get(sys.platform, ()):
+        if not os.path.exists(path):
+            continue
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(0.5)
+                sock.connect(path)
+            return True
+        except PermissionError:
+            # Root-only socket: the daemon is there, we just can't talk to it
+            return True
+        except OSError:
+            return False
+    return None
+
+
 def is_running() -> bool:
     """Check whether the Tailscale daemon is active."""
+    listening = _probe_daemon_socket()
+    if listening is not None:
+        return listening
     result = run(["tailscale", "status"])
     return result.returncode == 0
 
 
+# ── ACL watch (LocalAPI IPN bus) ─────────────────────────────
+# Instead of polling --apply-acl on a timer, follow tailscaled's IPN bus and
+# touch the ACL API only when the network map actually changes.
+
+# watch-ipn-bus mask: NotifyInitialNetMap | NotifyNoPrivateKeys
+_IPN_BUS_MASK = 8 | 16
+
+# Seconds to wait before reconnecting to a dropped IPN bus (doubles up to the cap)
+WATCH_RECONNECT_DELAY = 2.0
+WATCH_RECONNECT_MAX = 60.0
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection to tailscaled's LocalAPI unix socket."""
+
+    def __init__(self, path: str) -> None:
+        super().__init__("local-tailscaled.sock")
+        self._path = path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self._path)
+
+
+def _daemon_socket_path() -> Optional[str]:
+    """First existing tailscaled socket for this platform, if any."""
+    for path in _TAILSCALED_SOCKETS.get(sys.platform, ()):
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _watch_ipn_bus(path: str):
+    """Yield IPN bus notifications (one JSON object per line) until the stream ends."""
+    conn = _UnixHTTPConnection(path)
+    try:
+        conn.request("GET", f"/localapi/v0/watch-ipn-bus?mask={_IPN_BUS_MASK}")
+        resp = conn.getresponse()
+        if resp.status != 200:
+            raise ConnectionError(f"watch-ipn-bus failed: HTTP {resp.status}")
+        for line in resp:
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except ValueError as e:
+                    raise ConnectionError(f"malformed IPN bus message: {e}") from e
+    finally:
+        conn.close()
+
+
+def _netmap_fingerprint(netmap: dict) -> tuple:
+    """The parts of a netmap the ACL cares about: node addresses and tags."""
+    def node_key(node: dict) -> tuple:
+        return (
+            node.get("StableID", ""),
+            tuple(node.get("Addresses") or ()),
+            tuple(node.get("Tags") or ()),
+        )
+
+    self_node = netmap.get("SelfNode") or {}
+    peers = netmap.get("Peers") or ()
+    return node_key(self_node), tuple(sorted(node_key(p) for p in peers))
+
+
+def watch_acl() -> None:
+    """
+    Re-apply the Briven ACL whenever tailscaled reports a network map with
+    changed addresses or tags. Runs until interrupted.
+    """
+    path = _daemon_socket_path()
+    if path is None:
+        raise RuntimeError("tailscaled socket not found — is the daemon running?")
+
+    last = None
+    delay = WATCH_RECONNECT_DELAY
+    while True:
+        try:
+            with contextlib.closing(_watch_ipn_bus(path)) as bus:
+                for notify in bus:
+                    netmap = notify.get("NetMap")
+                    if not netmap:
+                        continue
+                    fingerprint = _netmap_fingerprint(netmap)
+                    if fingerprint != last:
+                        try:
+                            print(f"[tailscale] {apply_briven_acl()}", flush=True)
+                        except (OSError, RuntimeError) as e:  # OSError includes urllib.error.HTTPError
+                            # Reconnect after the backoff: the bus replays the
+                            # current netmap, so the apply is retried.
+                            logger.warning("ACL apply failed (%s); retrying in %.0fs", e, delay)
+                            break
+                        last = fingerprint
+                    delay = WATCH_RECONNECT_DELAY
+        except (OSError, http.client.HTTPException) as e:
+            logger.warning("IPN bus disconnected (%s); reconnecting in %.0fs", e, delay)
+        time.sleep(delay)
+        delay = min(delay * 2, WATCH_RECONNECT_MAX)
+
+
 def tailscale_serve(port: int, bg: bool = True) -> None:
     """
     Expose a local port via Tailscale Serve (HTTPS on tailnet, no public exposure).
@@ -277,11 +564,25 @@ def tailscale_serve(port: int, bg: bool = True) -> None:
         run(cmd, capture=False)
 
 
-def print_status() -> None:
+def _status_icons() -> tuple[str, str]:
+    """Online/offline peer markers: emoji if stdout can encode them, else ASCII."""
+    encoding = getattr(sys.stdout, "encoding", None)
+    if not encoding:
+        return "+", "-"
+    try:
+        "🟢🔴".encode(encoding)
+    except (UnicodeEncodeError, LookupError):
+        return "+", "-"
+    return "🟢", "🔴"
+
+
+def print_status(status: Optional[dict] = None) -> None:
     """Print a human-readable Tailscale status summary."""
-    ip4 = get_ip("4")
-    ip6 = get_ip("6")
-    peers = get_peers()
+    if status is None:
+        status = get_status()
+    ip4 = get_ip("4", status)
+    ip6 = get_ip("6", status)
+    peers = get_peers(status)
 
     print("=" * 48)
     print("  Briven — Tailscale Status")
@@ -291,8 +592,9 @@ def print_status() -> None:
     if ip6:
         print(f"  IPv6 : {ip6}")
     print(f"  Peers: {len(peers)}")
+    on_icon, off_icon = _status_icons()
     for p in peers:
-        status_icon = "+" if p["online"] else "-"
+        status_icon = on_icon if p["online"] else off_icon
         print(f"    {status_icon}  {p['hostname']} ({p['ip']})  [{p['os']}]")
     print("=" * 48)
     print(f"\n  Bind Briven to Tailscale IP for secure access:")
@@ -313,15 +615,21 @@ def main() -> None:
     parser.add_argument("--port", type=int, default=8000, help="Port to serve (used with --serve)")
     parser.add_argument("--apply-acl", action="store_true", help="Apply Briven zero-trust ACL policy")
     parser.add_argument("--acl-status", action="store_true", help="Check if Briven ACL is active")
+    parser.add_argument("--watch", action="store_true",
+                        help="With --apply-acl: re-apply on network map changes (runs until Ctrl-C)")
 
     args = parser.parse_args()
 
     # ACL commands don't require the local tailscale daemon
     if args.apply_acl:
         try:
-            msg = apply_briven_acl()
-            print(f"[tailscale] {msg}")
-        except (ValueError, requests.HTTPError) as e:
+            if args.watch:
+                watch_acl()
+            else:
+                print(f"[tailscale] {apply_briven_acl()}")
+        except KeyboardInterrupt:
+            pass
+        except (ValueError, RuntimeError, urllib.error.HTTPError) as e:
             print(f"[tailscale] ERROR: {e}", file=sys.stderr)
             sys.exit(1)
         return
@@ -330,27 +638,30 @@ def main() -> None:
         print(f"[tailscale] {acl_status()}")
         return
 
-    # CLI commands below require the local tailscale daemon
-    if not is_running():
+    # CLI commands below require the local tailscale daemon; one status call
+    # both checks that and feeds every command
+    try:
+        status = get_status()
+    except (RuntimeError, OSError, ValueError):
         print("[tailscale] Tailscale daemon not running or not installed.", file=sys.stderr)
         print("  Install: https://tailscale.com/download", file=sys.stderr)
         sys.exit(1)
 
     if args.status:
-        print_status()
+        print_status(status)
     elif args.ip:
-        ip = get_ip()
+        ip = get_ip(status=status)
         if ip:
             print(ip)
         else:
             print("Not connected to Tailscale.", file=sys.stderr)
             sys.exit(1)
     elif args.peers:
-        print(json.dumps(get_peers(), indent=2))
+        print(json.dumps(get_peers(status), indent=2))
     elif args.serve:
         tailscale_serve(args.port, bg=False)
     else:
-        print_status()
+        print_status(status)
 
 
 if __name__ == "__main__":
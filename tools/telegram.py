@@ -10,20 +10,54 @@ Usage:
 """
 
 import argparse
+import asyncio
+import atexit
+import functools
 import os
 import sys
-import urllib.parse
-import urllib.request
+import threading
 import json
 
+try:
+    from tools.http_keepalive import KeepAliveClient, json_bytes
+except ImportError:  # run as a script from inside tools/
+    from http_keepalive import KeepAliveClient, json_bytes
+
+_TELEGRAM_HEADERS = {"Content-Type": "application/json"}
+
+# Shared keep-alive client, created on first send and closed at exit
+_CLIENT: KeepAliveClient | None = None
+_CLIENT_LOCK = threading.Lock()
+
+# Retries per message on 429/5xx in send_many (Retry-After or backoff between)
+BATCH_RETRIES = 3
+
+
+def _get_client() -> KeepAliveClient:
+    global _CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            _CLIENT = KeepAliveClient(timeout=10)
+            atexit.register(_CLIENT.close)
+        return _CLIENT
+
+
+@functools.lru_cache(maxsize=8)
+def _send_url(token: str) -> str:
+    return f"https://api.telegram.org/bot{token}/sendMessage"
+
 
 def send_message(
     text: str,
     bot_token: str | None = None,
     chat_id: str | None = None,
     parse_mode: str = "Markdown",
+    retries: int = 0,
 ) -> dict:
-    """Send a message to a Telegram chat. Returns the API response."""
+    """
+    Send a message to a Telegram chat. Returns the API response.
+    On 429/5xx the request is retried up to `retries` times.
+    """
     token = bot_token or os.environ.get("TELEGRAM_BOT_TOKEN")
     chat = chat_id or os.environ.get("TELEGRAM_CHAT_ID")
 
@@ -32,21 +66,39 @@ def send_message(
     if not chat:
         raise ValueError("TELEGRAM_CHAT_ID not set in environment or .env")
 
-    url = f"https://api.telegram.org/bot{token}/sendMessage"
-    payload = json.dumps({
+    data = json_bytes({
         "chat_id": chat,
         "text": text,
         "parse_mode": parse_mode,
-    }).encode("utf-8")
-
-    req = urllib.request.Request(
-        url,
-        data=payload,
-        headers={"Content-Type": "application/json"},
-        method="POST",
-    )
-    with urllib.request.urlopen(req, timeout=10) as resp:
-        return json.loads(resp.read().decode("utf-8"))
+    })
+    status, body = _get_client().post(_send_url(token), data, _TELEGRAM_HEADERS, retries)
+    if status >= 400:
+        raise RuntimeError(f"Telegram API error {status}: {body.decode('utf-8', errors='replace')}")
+    return json.loads(body.decode("utf-8"))
+
+
+async def send_many(
+    msgs: list[str],
+    *,
+    concurrency: int = 8,
+    bot_token: str | None = None,
+    chat_id: str | None = None,
+    parse_mode: str = "Markdown",
+) -> list[dict | BaseException]:
+    """
+    Send a burst of messages, up to `concurrency` in flight at once, each on
+    its own pooled connection. Returns one API response or exception per
+    message, in input order. Delivery order is only kept with concurrency=1.
+    """
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _send(text: str) -> dict:
+        async with sem:
+            return await asyncio.to_thread(
+                send_message, text, bot_token, chat_id, parse_mode, BATCH_RETRIES
+            )
+
+    return await asyncio.gather(*(_send(m) for m in msgs), return_exceptions=True)
 
 
 def main() -> None:
@@ -12,10 +12,45 @@ Docs: https://developers.facebook.com/docs/whatsapp/cloud-api
 """
 
 import argparse
+import asyncio
+import atexit
+import functools
 import json
 import os
 import sys
-import urllib.request
+import threading
+
+try:
+    from tools.http_keepalive import KeepAliveClient, json_bytes
+except ImportError:  # run as a script from inside tools/
+    from http_keepalive import KeepAliveClient, json_bytes
+
+# Shared keep-alive client, created on first send and closed at exit
+_CLIENT: KeepAliveClient | None = None
+_CLIENT_LOCK = threading.Lock()
+
+# Retries per message on 429/5xx in send_many (Retry-After or backoff between)
+BATCH_RETRIES = 3
+
+
+def _get_client() -> KeepAliveClient:
+    global _CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            _CLIENT = KeepAliveClient(timeout=15)
+            atexit.register(_CLIENT.close)
+        return _CLIENT
+
+
+@functools.lru_cache(maxsize=8)
+def _messages_url(phone_id: str) -> str:
+    return f"https://graph.facebook.com/v19.0/{phone_id}/messages"
+
+
+@functools.lru_cache(maxsize=8)
+def _headers(token: str) -> dict:
+    # Shared per token: callers must not mutate the returned dict
+    return {"Content-Type": "application/json", "Authorization": f"Bearer {token}"}
 
 
 def send_text(
@@ -23,8 +58,12 @@ def send_text(
     to: str | None = None,
     token: str | None = None,
     phone_id: str | None = None,
+    retries: int = 0,
 ) -> dict:
-    """Send a plain text WhatsApp message via Cloud API."""
+    """
+    Send a plain text WhatsApp message via Cloud API.
+    On 429/5xx the request is retried up to `retries` times.
+    """
     _token = token or os.environ.get("WHATSAPP_TOKEN")
     _phone_id = phone_id or os.environ.get("WHATSAPP_PHONE_ID")
     _to = to or os.environ.get("WHATSAPP_RECIPIENT")
@@ -36,25 +75,40 @@ def send_text(
     if not _to:
         raise ValueError("Recipient phone number required (--to or WHATSAPP_RECIPIENT)")
 
-    url = f"https://graph.facebook.com/v19.0/{_phone_id}/messages"
-    payload = json.dumps({
+    data = json_bytes({
         "messaging_product": "whatsapp",
         "to": _to.lstrip("+"),
         "type": "text",
         "text": {"body": message},
-    }).encode("utf-8")
-
-    req = urllib.request.Request(
-        url,
-        data=payload,
-        headers={
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {_token}",
-        },
-        method="POST",
-    )
-    with urllib.request.urlopen(req, timeout=15) as resp:
-        return json.loads(resp.read().decode("utf-8"))
+    })
+    status, body = _get_client().post(_messages_url(_phone_id), data, _headers(_token), retries)
+    if status >= 400:
+        raise RuntimeError(f"WhatsApp API error {status}: {body.decode('utf-8', errors='replace')}")
+    return json.loads(body.decode("utf-8"))
+
+
+async def send_many(
+    msgs: list[str],
+    *,
+    concurrency: int = 8,
+    to: str | None = None,
+    token: str | None = None,
+    phone_id: str | None = None,
+) -> list[dict | BaseException]:
+    """
+    Send a burst of text messages, up to `concurrency` in flight at once, each
+    on its own pooled connection. Returns one API response or exception per
+    message, in input order. Delivery order is only kept with concurrency=1.
+    """
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _send(message: str) -> dict:
+        async with sem:
+            return await asyncio.to_thread(
+                send_text, message, to, token, phone_id, BATCH_RETRIES
+            )
+
+    return await asyncio.gather(*(_send(m) for m in msgs), return_exceptions=True)
 
 
 def main() -> None: